@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Near-duplicate guard over the recorded search fixtures.
+
+Parses the cards in ``bench/fixtures/search_page*.html`` (no browser
+needed) and runs them through ``NearDuplicateIndex`` the way a search does.
+Fails if a distinct job is dropped as a repost of another, e.g. "Software
+Engineer @ Hooli" as a copy of "Full Stack Developer @ Globex Solutions",
+or if reposts of the same role at the same company are not collapsed.
+
+    python bench/dedupe_check.py
+"""
+
+import glob
+import os
+import sys
+import tempfile
+from html.parser import HTMLParser
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+
+sys.path.insert(0, ROOT_DIR)
+
+from src.dedupe import NearDuplicateIndex, company_key, jaccard, shingles  # noqa: E402
+
+# Class of the element holding each card field, as in the fixtures
+_FIELD_CLASSES = {"title": "title", "company": "comp-name", "snippet": "job-desc", "tags": "tags-gt"}
+
+
+class _CardParser(HTMLParser):
+    """Collect ``{job_id, title, company, snippet}`` dicts from a search page."""
+
+    def __init__(self):
+        super().__init__()
+        self.jobs = []
+        self._field = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        if "srp-jobtuple-wrapper" in classes:
+            self.jobs.append({"job_id": attrs.get("data-job-id", ""), "title": "", "company": "", "snippet": ""})
+            return
+        for field, css_class in _FIELD_CLASSES.items():
+            if css_class in classes:
+                self._field = "snippet" if field == "tags" else field
+
+    def handle_endtag(self, tag):
+        if tag in ("a", "span", "ul"):
+            self._field = None
+
+    def handle_data(self, data):
+        if self._field and self.jobs and data.strip():
+            job = self.jobs[-1]
+            job[self._field] = f"{job[self._field]} {data.strip()}".strip()
+
+
+def load_cards():
+    jobs = []
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "search_page*.html"))):
+        parser = _CardParser()
+        with open(path, "r", encoding="utf-8") as f:
+            parser.feed(f.read())
+        jobs += parser.jobs
+    return jobs
+
+
+def main():
+    jobs = load_cards()
+    by_key = {job["job_id"]: job for job in jobs}
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NearDuplicateIndex(path=os.path.join(tmp, "near_dupes.json"))
+
+        # The pair the snippet-heavy shingles used to merge
+        globex = next(job for job in jobs if job["company"] == "Globex Solutions")
+        hooli = next(job for job in jobs if job["company"] == "Hooli")
+        index.check_and_add(globex)
+        if index.check_and_add(hooli) is not None:
+            failures.append(f"{hooli['title']} @ {hooli['company']} dropped as a copy of "
+                            f"{globex['title']} @ {globex['company']}")
+
+        dropped = 0
+        for job in jobs:
+            original_key = index.check_and_add(job)
+            if original_key is None:
+                continue
+            dropped += 1
+            original = by_key[original_key]
+            if company_key(job) != company_key(original) or \
+                    jaccard(shingles(job), shingles(original)) < index.threshold:
+                failures.append(f"{job['title']} @ {job['company']} dropped as a copy of "
+                                f"{original['title']} @ {original['company']}")
+
+    distinct = {(company_key(job), job["title"]) for job in jobs}
+    print(f"{len(jobs)} fixture cards, {len(distinct)} distinct roles, {dropped} dropped as reposts")
+    if dropped != len(jobs) - len(distinct):
+        failures.append(f"expected {len(jobs) - len(distinct)} reposts collapsed, got {dropped}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Import-time guard for the CLI entry point.
+
+Runs ``python -X importtime -c "import main"`` in a fresh interpreter and
+fails if the browser stack gets imported at module level again, or if the
+cumulative import time of ``main`` exceeds the budget.
+
+    python bench/import_time.py [--budget-ms 250] [--runs 5]
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that status/export must never pay for
+FORBIDDEN = ("undetected_chromedriver", "selenium", "dotenv", "psutil",
+             "src.browser", "src.auth", "src.profile", "src.search", "src.apply")
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure_once():
+    """Return ({module: cumulative_us} for top-level imports, set of all modules imported)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        _, cum_us, indent, name = match.groups()
+        imported.add(name)
+        if len(indent) == 1:
+            cumulative[name] = int(cum_us)
+    return cumulative, imported
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="Max median cumulative import time of main")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to sample")
+    args = parser.parse_args()
+
+    samples = []
+    imported = set()
+    for _ in range(args.runs):
+        cumulative, names = measure_once()
+        samples.append(cumulative.get("main", 0) / 1000)
+        imported |= names
+
+    median_ms = statistics.median(samples)
+    print(f"import main: median {median_ms:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    leaked = [name for name in FORBIDDEN if name in imported]
+    if leaked:
+        print("FAIL: browser-stack modules imported by main: " + ", ".join(leaked))
+        failed = True
+    if median_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Offline benchmark for the search and apply hot paths.
+
+Serves the saved Naukri page snapshots in ``bench/fixtures`` from a local
+HTTP server and drives the real ``src.search`` / ``src.apply`` functions
+against them with a headless Chrome. Reports per-stage latency percentiles
+and WebDriver command counts, and exits non-zero when a stage regresses
+against ``bench/baseline.json``. With ``--ci`` (or ``CI`` set in the
+environment) a missing baseline, or a stage the baseline doesn't cover,
+is a failure too, so the gate can't pass by having nothing to compare.
+
+The committed baseline holds only the command counts, which don't depend
+on the machine: each stage starts from empty locator statistics and its
+warm-up run does the first-lookup probes. Waits that time out poll on the
+clock, so their counts are upper bounds (a 3 s wait polls at most 7 times).
+p95 latency is only gated for stages whose baseline entry has a ``p95_ms``,
+recorded with ``--update-baseline --record-timings`` on the machine that
+runs the gate.
+
+Needs Chrome and a matching chromedriver on PATH (or ``CHROMEDRIVER``);
+no network access is used.
+
+    python bench/run_bench.py [--iterations 10] [--tolerance 0.25] [--update-baseline [--record-timings]] [--ci]
+"""
+
+import argparse
+import functools
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+sys.path.insert(0, ROOT_DIR)
+
+from selenium import webdriver  # noqa: E402
+from selenium.webdriver.chrome.service import Service  # noqa: E402
+
+import src.apply  # noqa: E402
+import src.locators  # noqa: E402
+import src.search  # noqa: E402
+
+
+# -- environment ----------------------------------------------------------
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def create_bench_driver():
+    """Plain headless Chrome; the hot paths under test don't depend on uc patches."""
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.page_load_strategy = "eager"
+
+    chromedriver = os.getenv("CHROMEDRIVER")
+    service = Service(executable_path=chromedriver) if chromedriver else Service()
+    driver = webdriver.Chrome(options=options, service=service)
+    driver.set_page_load_timeout(30)
+    driver.implicitly_wait(0)
+    return driver
+
+
+def count_commands(driver):
+    """Wrap ``driver.execute`` so every WebDriver command (incl. element calls) is counted."""
+    counter = {"calls": 0}
+    original = driver.execute
+
+    @functools.wraps(original)
+    def execute(*args, **kwargs):
+        counter["calls"] += 1
+        return original(*args, **kwargs)
+
+    driver.execute = execute
+    return counter
+
+
+def disable_delays():
+    """Deliberate human-like delays are not part of the hot path being measured."""
+    def no_delay(*args, **kwargs):
+        return None
+
+    for module in (src.search, src.apply):
+        module.random_delay = no_delay
+        module.random_scroll = no_delay
+
+
+def reset_locators():
+    """Forget learned selector variants, so a stage's counts don't depend on earlier stages or ``data/``.
+
+    Periodic re-probes are off too: the warm-up run probes once and every
+    timed run then takes the same lookup path.
+    """
+    src.locators._stats = {}
+    src.locators._probed.clear()
+    src.locators.PROBE_EVERY = sys.maxsize
+
+
+# -- stages ---------------------------------------------------------------
+
+def build_stages(base_url):
+    """Return ``{name: (setup, run)}``; only ``run`` is timed and counted."""
+    def load(page):
+        return lambda driver: driver.get(f"{base_url}/{page}")
+
+    return {
+        "parse_job_listings[script]": (
+            load("search_page1.html"),
+            lambda driver: src.search.parse_job_listings(driver, mode="script"),
+        ),
+        "parse_job_listings[element]": (
+            load("search_page1.html"),
+            lambda driver: src.search.parse_job_listings(driver, mode="element"),
+        ),
+        "paginate": (
+            load("search_page1.html"),
+            src.search.paginate,
+        ),
+        "_apply_single_job[easy_apply]": (
+            lambda driver: None,
+            lambda driver: src.apply._apply_single_job(driver, {"link": f"{base_url}/job_detail.html"}),
+        ),
+        "handle_apply_flow[chatbot]": (
+            load("job_chatbot.html"),
+            src.apply.handle_apply_flow,
+        ),
+        "handle_apply_flow[already_applied]": (
+            load("job_already_applied.html"),
+            src.apply.handle_apply_flow,
+        ),
+    }
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_stage(driver, counter, setup, run, iterations):
+    latencies = []
+    calls = []
+    for _ in range(iterations):
+        setup(driver)
+        before = counter["calls"]
+        started = time.perf_counter()
+        run(driver)
+        latencies.append((time.perf_counter() - started) * 1000)
+        calls.append(counter["calls"] - before)
+    return {
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.mean(latencies),
+        "calls": max(calls),
+    }
+
+
+# -- regression check -----------------------------------------------------
+
+def compare(results, baseline, tolerance, strict=False):
+    """Return a list of regression messages (empty when everything is within budget).
+
+    Command counts are always compared; p95 only where the baseline has a
+    timing for the stage. With ``strict``, a stage missing from ``baseline``
+    is reported as well.
+    """
+    failures = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            if strict:
+                failures.append(f"{name}: no baseline recorded")
+            continue
+        if base.get("p95_ms") is not None:
+            limit_ms = base["p95_ms"] * (1 + tolerance)
+            if result["p95_ms"] > limit_ms:
+                failures.append(f"{name}: p95 {result['p95_ms']:.0f} ms > {limit_ms:.0f} ms")
+        if result["calls"] > base["calls"]:
+            failures.append(f"{name}: {result['calls']} WebDriver calls > baseline {base['calls']}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10, help="Timed runs per stage")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 slowdown vs baseline (fraction)")
+    parser.add_argument("--stage", action="append", help="Only run stages whose name contains this (repeatable)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write command counts to bench/baseline.json")
+    parser.add_argument("--record-timings", action="store_true",
+                        help="With --update-baseline, record latencies too (only on the machine that runs the gate)")
+    parser.add_argument("--ci", action="store_true", default=bool(os.getenv("CI")),
+                        help="Fail when there is no baseline to compare against (default when CI is set)")
+    args = parser.parse_args()
+
+    disable_delays()
+    server, base_url = start_fixture_server()
+    driver = create_bench_driver()
+    counter = count_commands(driver)
+
+    results = {}
+    try:
+        for name, (setup, run) in build_stages(base_url).items():
+            if args.stage and not any(s in name for s in args.stage):
+                continue
+            reset_locators()
+            # One untimed warm-up run so first-load costs and locator probes don't skew the results
+            setup(driver)
+            run(driver)
+            results[name] = run_stage(driver, counter, setup, run, args.iterations)
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    print(f"{'stage':40} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'calls':>6}")
+    for name, r in results.items():
+        print(f"{name:40} {r['p50_ms']:9.1f} {r['p95_ms']:9.1f} {r['p99_ms']:9.1f} {r['calls']:6d}")
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    if args.update_baseline:
+        for name, r in results.items():
+            # Timings recorded earlier stay unless new ones are asked for
+            entry = baseline.setdefault(name, {})
+            entry["calls"] = r["calls"]
+            if args.record_timings:
+                entry.update({key: value for key, value in r.items() if key.endswith("_ms")})
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {BASELINE_PATH}")
+        return 0
+
+    if not baseline:
+        print("No baseline yet — run with --update-baseline to record one")
+        return 1 if args.ci else 0
+
+    failures = compare(results, baseline, args.tolerance, strict=args.ci)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,21 +5,25 @@ import argparse
 import json
 import os
 import sys
+import time
 
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
 
-from src.auth import login
-from src.browser import create_driver
-from src.profile import refresh_profile, update_resume_headline, update_skills
-from src.search import search_jobs
-from src.apply import apply_to_jobs
-from src.tracker import export_csv, get_stats
-from src.utils import log_error, log_info, setup_logger
+# Browser-stack modules (undetected_chromedriver, selenium, dotenv) are
+# imported inside the commands that drive a browser, so tracker-only commands
+# like status and export start without paying for them.
+from src import metrics
+from src.tracker import get_backend
+from src.utils import log_error, log_info, log_warn, setup_logger
 
 CONFIG_PATH = os.path.join(os.path.dirname(__file__), "config.json")
 console = Console()
 
+# Commands that also refresh the metrics textfile periodically while running
+LONG_RUNNING_COMMANDS = ("apply", "update", "serve")
+
 
 def load_config():
     with open(CONFIG_PATH, "r") as f:
@@ -28,8 +32,14 @@ def load_config():
 
 def cmd_login(args):
     """Login to Naukri and save session cookies."""
+    from src.auth import login
+    from src.locators import log_locator_report
+    from src.supervisor import SupervisedDriver
+    from src.waits import log_wait_stats
+
     setup_logger()
-    driver = create_driver(headless=not args.visible)
+    config = load_config()
+    driver = SupervisedDriver.from_config(config, headless=not args.visible)
     try:
         if login(driver):
             log_info("Login complete — session saved")
@@ -37,41 +47,78 @@ def cmd_login(args):
             log_error("Login failed")
             sys.exit(1)
     finally:
+        log_wait_stats()
+        log_locator_report()
         driver.quit()
 
 
+def _print_apply_results(results):
+    console.print(f"\n[bold green]Applied:[/] {results['applied']}")
+    console.print(f"[bold yellow]Skipped:[/] {results['skipped']}")
+    console.print(f"[bold red]Failed:[/] {results['failed']}")
+
+
+def _print_perf_summary(summary):
+    by_kind = summary["by_kind_s"]
+    console.print(
+        f"\n[bold]Run time:[/] {summary['wall_s']:.1f}s — "
+        f"browser {by_kind['browser']:.1f}s, delays {by_kind['delay']:.1f}s, "
+        f"local {by_kind['local']:.1f}s, untracked {summary['untracked_s']:.1f}s "
+        f"(process CPU {summary['process_cpu_s']:.1f}s)"
+    )
+
+    table = Table(title="Hot-path spans")
+    table.add_column("Span", style="cyan")
+    table.add_column("Kind")
+    for column in ("Count", "Total s", "p50 s", "p95 s"):
+        table.add_column(column, justify="right")
+    for name, entry in summary["spans"].items():
+        table.add_row(
+            name, entry["kind"], str(entry["count"]), f"{entry['total_s']:.2f}",
+            f"{entry['p50_s']:.2f}", f"{entry['p95_s']:.2f}",
+        )
+    console.print(table)
+
+
 def cmd_apply(args):
     """Run full search + apply cycle."""
+    from src import perf
+    from src.apply import run_apply_cycle
+    from src.auth import login
+    from src.locators import log_locator_report
+    from src.supervisor import SupervisedDriver
+    from src.waits import log_wait_stats
+
     setup_logger()
+    perf.reset()
     config = load_config()
-    driver = create_driver(headless=not args.visible)
+    driver = SupervisedDriver.from_config(config, headless=not args.visible)
     try:
         if not login(driver):
             log_error("Cannot apply — login failed")
             sys.exit(1)
 
-        log_info("Searching for jobs...")
-        jobs = search_jobs(driver, config, max_pages=args.pages)
-
-        if not jobs:
-            log_info("No jobs found matching your criteria")
-            return
-
-        log_info(f"Found {len(jobs)} jobs — starting apply cycle")
-        results = apply_to_jobs(driver, jobs, config)
-
-        console.print(f"\n[bold green]Applied:[/] {results['applied']}")
-        console.print(f"[bold yellow]Skipped:[/] {results['skipped']}")
-        console.print(f"[bold red]Failed:[/] {results['failed']}")
+        results = run_apply_cycle(driver, config, max_pages=args.pages, stream=args.stream, resume=args.resume)
+        _print_apply_results(results)
     finally:
+        log_wait_stats()
+        log_locator_report()
         driver.quit()
+        _print_perf_summary(perf.summary())
+        log_info(f"Performance report written to {perf.write_report()}")
 
 
 def cmd_update(args):
     """Update profile skills and refresh profile."""
+    from src.auth import login
+    from src.locators import log_locator_report
+    from src.profile import ProfileSession
+    from src.supervisor import SupervisedDriver
+    from src.waits import log_wait_stats
+
     setup_logger()
     config = load_config()
-    driver = create_driver(headless=not args.visible)
+    driver = SupervisedDriver.from_config(config, headless=not args.visible)
     try:
         if not login(driver):
             log_error("Cannot update profile — login failed")
@@ -79,25 +126,113 @@ def cmd_update(args):
 
         profile_cfg = config.get("profile", {})
 
-        skills = profile_cfg.get("skills", [])
-        if skills:
-            update_skills(driver, skills)
-
-        headline = profile_cfg.get("headline", "")
-        if headline:
-            update_resume_headline(driver, headline)
-
+        # One visit to the profile page; only skills and headline that differ are edited
+        session = ProfileSession(driver)
+        session.set_skills(profile_cfg.get("skills", []))
+        session.set_headline(profile_cfg.get("headline", ""))
         if profile_cfg.get("auto_refresh_daily", False):
-            refresh_profile(driver)
+            session.refresh()
+        result = session.apply()
 
-        log_info("Profile update complete")
+        log_info(f"Profile update complete — {result['page_loads']} page load(s) in {result['seconds']:.1f}s")
     finally:
+        log_wait_stats()
+        log_locator_report()
         driver.quit()
 
 
+def cmd_serve(args):
+    """Run as a daemon with a warm browser and an internal scheduler."""
+    from src.daemon import Daemon
+
+    setup_logger()
+    config = load_config()
+    if args.port:
+        config.setdefault("daemon", {})["port"] = args.port
+
+    daemon = Daemon(config, headless=not args.visible)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        log_info("Daemon stopped")
+
+
+def cmd_netbench(args):
+    """Compare page load time and bytes before and after eager loading and resource blocking."""
+    from src.browser import create_driver, measure_page_load
+    from src.search import _build_search_url
+
+    setup_logger()
+    config = load_config()
+    browser_cfg = config.get("browser", {})
+    keywords = config.get("search", {}).get("keywords", []) or ["python developer"]
+    url = args.url or _build_search_url(keywords[0], config)
+
+    # The baseline is a browser as it was before: full page loads, nothing blocked
+    profiles = {
+        "baseline": {**browser_cfg, "page_load_strategy": "normal",
+                     "blocked_url_patterns": [], "block_resource_types": []},
+        "configured": browser_cfg,
+    }
+    results = {}
+    for label, profile_cfg in profiles.items():
+        # One browser at a time: a persistent user_data_dir can't be opened twice
+        driver = create_driver(headless=not args.visible, browser_config=profile_cfg, capture_network=True)
+        try:
+            runs = [measure_page_load(driver, url) for _ in range(args.runs)]
+        finally:
+            driver.quit()
+        results[label] = {key: sum(r[key] for r in runs) / len(runs) for key in runs[0]}
+
+    table = Table(title=f"Page load: {url}")
+    table.add_column("Profile", style="cyan")
+    for column in ("wall ms", "DOMContentLoaded ms", "load ms", "requests", "KB"):
+        table.add_column(column, justify="right")
+    for label, r in results.items():
+        strategy = profiles[label].get("page_load_strategy", "eager")
+        table.add_row(
+            f"{label} ({strategy})", f"{r['wall_ms']:.0f}", f"{r['dom_content_loaded_ms']:.0f}",
+            f"{r['load_ms']:.0f}", f"{r['requests']:.0f}", f"{r['bytes'] / 1024:.0f}",
+        )
+    console.print(table)
+
+
+def cmd_selectors(args):
+    """Show which selector variant matches for each named element."""
+    from src.locators import LOCATORS, dead_variants, get_stats
+
+    stats = get_stats()
+    dead = set(dead_variants())
+
+    table = Table(title="Selector variants")
+    table.add_column("Locator", style="cyan")
+    table.add_column("Variant")
+    for column in ("Hits", "Probes matched", "Last hit"):
+        table.add_column(column, justify="right")
+    table.add_column("Status")
+    for name, declared in LOCATORS.items():
+        entry = stats.get(name, {"probes": 0, "last": None, "variants": {}})
+        for variant in declared:
+            variant_stats = entry["variants"].get(variant, {})
+            last_hit = variant_stats.get("last_hit")
+            if variant == entry["last"]:
+                status = "[green]current[/]"
+            elif (name, variant) in dead:
+                status = "[red]dead[/]"
+            else:
+                status = ""
+            table.add_row(
+                name, escape(variant), str(variant_stats.get("hits", 0)),
+                f"{variant_stats.get('probe_hits', 0)}/{entry['probes']}",
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(last_hit)) if last_hit else "-",
+                status,
+            )
+    console.print(table)
+
+
 def cmd_status(args):
     """Show applied jobs statistics."""
-    stats = get_stats()
+    stats = get_backend(load_config()).get_stats()
 
     console.print(f"\n[bold]Naukri Auto-Apply Stats[/]\n")
     console.print(f"  Total applied: [bold green]{stats['total']}[/]")
@@ -119,7 +254,7 @@ def cmd_status(args):
 def cmd_export(args):
     """Export applied jobs to CSV."""
     output = args.output or None
-    path = export_csv(output)
+    path = get_backend(load_config()).export_csv(output)
     if path:
         log_info(f"Exported to: {path}")
     else:
@@ -141,10 +276,24 @@ def main():
     # apply
     apply_parser = subparsers.add_parser("apply", help="Search and auto-apply to jobs")
     apply_parser.add_argument("--pages", type=int, default=3, help="Max search result pages per keyword (default: 3)")
+    apply_parser.add_argument("--stream", action="store_true", help="Start applying after the first results page instead of crawling every keyword first")
+    apply_parser.add_argument("--resume", action="store_true", help="Continue an interrupted apply session from its checkpoint without searching again")
 
     # update
     subparsers.add_parser("update", help="Update profile skills and refresh")
 
+    # serve
+    serve_parser = subparsers.add_parser("serve", help="Run as a daemon with scheduled apply/refresh and a local control endpoint")
+    serve_parser.add_argument("--port", type=int, help="Control endpoint port (default: daemon.port in config, 8765)")
+
+    # netbench
+    netbench_parser = subparsers.add_parser("netbench", help="Measure page load time/bytes before and after eager loading + resource blocking")
+    netbench_parser.add_argument("--url", help="Page to load (default: search URL for the first keyword)")
+    netbench_parser.add_argument("--runs", type=int, default=3, help="Loads per profile (default: 3)")
+
+    # selectors
+    subparsers.add_parser("selectors", help="Show selector variant hit statistics and dead variants")
+
     # status
     subparsers.add_parser("status", help="Show applied jobs statistics")
 
@@ -162,11 +311,42 @@ def main():
         "login": cmd_login,
         "apply": cmd_apply,
         "update": cmd_update,
+        "serve": cmd_serve,
+        "netbench": cmd_netbench,
+        "selectors": cmd_selectors,
         "status": cmd_status,
         "export": cmd_export,
     }
 
-    commands[args.command](args)
+    config = load_config()
+    metrics_cfg = config.get("metrics", {})
+    textfile_dir = metrics_cfg.get("textfile_dir")
+    if not textfile_dir:
+        commands[args.command](args)
+        return
+
+    # One file per command so e.g. `status` doesn't overwrite the last `apply` metrics
+    if not os.path.isabs(textfile_dir):
+        textfile_dir = os.path.join(os.path.dirname(__file__), textfile_dir)
+    textfile = os.path.join(textfile_dir, f"naukri_{args.command}.prom")
+
+    started = time.time()
+    stop_writer = None
+    if args.command in LONG_RUNNING_COMMANDS:
+        stop_writer = metrics.start_periodic_writer(textfile, metrics_cfg.get("interval_seconds", 60),
+                                                    command=args.command)
+    try:
+        commands[args.command](args)
+    finally:
+        if stop_writer is not None:
+            stop_writer.set()
+        try:
+            metrics.TRACKER_SIZE.set(get_backend(config).get_stats()["total"])
+        except Exception as e:
+            # Must not replace the command's own exception
+            log_warn(f"Could not read tracker stats for metrics: {e}")
+        metrics.record_command(args.command, started)
+        metrics.write_textfile(textfile, command=args.command)
 
 
 if __name__ == "__main__":
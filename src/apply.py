@@ -1,107 +1,148 @@
 from datetime import date
 
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
-from src.tracker import is_already_applied, save_applied
+from src import locators
+from src.auth import SessionLostError
+from src.checkpoint import SessionCheckpoint
+from src.dedupe import NearDuplicateIndex
+from src.filters import drop_near_duplicates, filter_jobs, iter_filtered, job_key, log_filter_summary
+from src.job_store import EXTRACT_DETAIL_JS, JobStore
+from src.metrics import APPLY_RESULTS
+from src.perf import span
+from src.retry_queue import (ALREADY_APPLIED, BUTTON_NOT_FOUND, CHATBOT_UNANSWERED, DRIVER_ERROR, NO_LINK,
+                             TIMEOUT, RetryQueue)
+from src.scoring import iter_ranked, rank_jobs
+from src.search import iter_job_pages, search_jobs
+from src.tracker import SessionTracker, get_backend, load_applied_keys
 from src.utils import log_error, log_info, log_warn, random_delay, random_scroll
+from src.waits import find_if_present, wait_optional
 
 
 def handle_apply_flow(driver):
     """Handle different apply types after clicking the apply button.
 
     Handles Naukri's easy-apply modal, chatbot questions, and external redirects.
-    Returns True if application was submitted successfully.
+    Returns ``(submitted, reason)``; ``reason`` is a retry_queue reason code
+    when the application was not submitted.
     """
     try:
-        wait = WebDriverWait(driver, 10)
-
         # Check for chatbot/questionnaire modal
-        try:
-            chatbot = WebDriverWait(driver, 3).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, ".chatbot-container, [class*='chatbot'], .apply-dialog"))
-            )
+        chatbot = locators.wait_optional_locator(driver, "apply.chatbot", timeout=3)
+        if chatbot:
             # Try to submit chatbot with default answers
-            submit_btns = chatbot.find_elements(By.CSS_SELECTOR, "button[type='submit'], button.submit, button[class*='submit']")
-            if submit_btns:
-                submit_btns[0].click()
+            submit_btn = locators.find(chatbot, "apply.chatbot_submit")
+            if submit_btn:
+                submit_btn.click()
                 random_delay(2, 3)
                 log_info("  Submitted chatbot/questionnaire")
-                return True
-        except Exception:
-            pass
+                return True, None
+            log_warn("  Chatbot has no submit button")
+            return False, CHATBOT_UNANSWERED
 
         # Check for "Already Applied" message
-        try:
-            already = driver.find_element(By.XPATH, "//*[contains(text(), 'already applied') or contains(text(), 'Already Applied')]")
-            if already.is_displayed():
-                log_warn("  Already applied to this job")
-                return False
-        except Exception:
-            pass
+        already = find_if_present(
+            driver, By.XPATH,
+            "//*[contains(text(), 'already applied') or contains(text(), 'Already Applied')]",
+            label="already applied message",
+        )
+        if already and already.is_displayed():
+            log_warn("  Already applied to this job")
+            return False, ALREADY_APPLIED
 
         # Check for success confirmation
-        try:
-            WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'applied successfully') or contains(text(), 'Application Submitted') or contains(text(), 'Successfully Applied')]"))
-            )
-            return True
-        except Exception:
-            pass
+        if wait_optional(
+            driver,
+            EC.presence_of_element_located((By.XPATH, "//*[contains(text(), 'applied successfully') or contains(text(), 'Application Submitted') or contains(text(), 'Successfully Applied')]")),
+            timeout=5,
+            label="apply success message",
+        ):
+            return True, None
 
         # If we reach here, assume the apply click itself was enough (easy apply)
-        return True
+        return True, None
 
     except Exception as e:
         log_error(f"  Error in apply flow: {e}")
-        return False
+        return False, DRIVER_ERROR
 
 
-def _apply_single_job(driver, job):
-    """Attempt to apply to a single job. Returns True on success."""
+def _store_job_details(driver, job, job_store):
+    """Save the open job page's description and metadata to ``job_store``."""
+    try:
+        details = driver.execute_script(EXTRACT_DETAIL_JS)
+    except Exception as e:
+        log_warn(f"  Could not read job details: {e}")
+        return
+    if details and details.get("description"):
+        job_store.put(job_key(job), details, link=job.get("link", ""))
+
+
+def _apply_single_job(driver, job, job_store=None):
+    """Attempt to apply to a single job.
+
+    Returns ``(applied, reason)`` like ``handle_apply_flow``.
+    """
     link = job.get("link", "")
     if not link:
-        return False
+        return False, NO_LINK
 
     try:
-        driver.get(link)
+        with span("driver.get:job"):
+            driver.get(link)
         random_delay(3, 5)
         random_scroll(driver)
 
-        wait = WebDriverWait(driver, 10)
-
         # Find the apply button
-        apply_btn = wait.until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR,
-                "button#apply-button, button[class*='apply'], .apply-btn, "
-                "button[id*='apply'], .apply-button-container button, "
-                "a[class*='apply-button']"
-            ))
-        )
+        try:
+            apply_btn = locators.wait_for_locator(driver, "apply.button", timeout=10, clickable=True)
+        except TimeoutException:
+            log_error("  Could not apply: apply button not found")
+            return False, BUTTON_NOT_FOUND
+
+        # Naukri renders job pages client-side: once the apply button is there, so is the description
+        if job_store is not None:
+            _store_job_details(driver, job, job_store)
 
         # Check if button says "Applied" already
         btn_text = apply_btn.text.strip().lower()
         if "applied" in btn_text:
             log_warn(f"  Already applied: {job.get('title', 'Unknown')}")
-            return False
+            return False, ALREADY_APPLIED
 
         random_scroll(driver)
         random_delay(1, 2)
-        apply_btn.click()
+        with span("apply.click"):
+            apply_btn.click()
         random_delay(3, 5)
 
-        return handle_apply_flow(driver)
+        with span("apply.flow"):
+            return handle_apply_flow(driver)
 
+    except TimeoutException as e:
+        log_error(f"  Could not apply: timed out ({e.msg or 'page load'})")
+        return False, TIMEOUT
+    except SessionLostError:
+        # Every later job would fail the same way; end the run instead
+        raise
     except Exception as e:
         log_error(f"  Could not apply: {e}")
-        return False
+        return False, DRIVER_ERROR
 
 
-def apply_to_jobs(driver, jobs, config):
+def apply_to_jobs(driver, jobs, config, near_dupes=None, job_store=None, retry_queue=None, checkpoint=None):
     """Main apply loop — iterate through jobs and apply.
 
-    Respects daily limits, blacklists, and deduplication via tracker.
+    Respects daily limits, blacklists, and deduplication via tracker. ``jobs``
+    may be a list or a generator (e.g. a streamed search); a generator is
+    closed as soon as the daily limit is reached so no further pages are crawled.
+    Applied jobs are added to the ``near_dupes`` index, if given, and saved.
+    Each opened job page is saved to ``job_store``, if given. Transient
+    failures are queued on ``retry_queue``, if given; jobs that are applied to
+    or skipped are removed from it. Every processed job is marked done on
+    ``checkpoint``, if given, which is finished when the loop ends normally.
     """
     filters = config.get("filters", {})
     max_daily = filters.get("max_daily_apply", 50)
@@ -112,48 +153,94 @@ def apply_to_jobs(driver, jobs, config):
     skipped_count = 0
     failed_count = 0
 
-    for job in jobs:
-        if applied_count >= max_daily:
-            log_warn(f"Reached daily apply limit ({max_daily})")
-            break
-
-        job_id = job.get("job_id") or job.get("link", "")
-        title = job.get("title", "Unknown")
-        company = job.get("company", "Unknown")
-
-        # Skip if already applied
-        if skip_applied and is_already_applied(job_id):
-            log_info(f"  Skipping (already applied): {title} @ {company}")
-            skipped_count += 1
-            continue
-
-        # Skip blacklisted companies
-        if company.lower() in blacklist:
-            log_warn(f"  Skipping (blacklisted): {title} @ {company}")
-            skipped_count += 1
-            continue
-
-        log_info(f"Applying: {title} @ {company}")
-
-        success = _apply_single_job(driver, job)
-
-        if success:
-            applied_count += 1
-            save_applied({
-                "job_id": job_id,
-                "title": title,
-                "company": company,
-                "location": job.get("location", ""),
-                "link": job.get("link", ""),
-                "date": str(date.today()),
-                "status": "applied",
-            })
-            log_info(f"  Applied successfully ({applied_count}/{max_daily})")
-        else:
-            failed_count += 1
-            log_warn(f"  Failed to apply")
-
-        random_delay(3, 6)
+    # History is loaded once; new records are buffered and flushed in batches
+    tracker = SessionTracker.from_config(config)
+    try:
+        for job in jobs:
+            if applied_count >= max_daily:
+                log_warn(f"Reached daily apply limit ({max_daily})")
+                break
+
+            job_id = job_key(job)
+            title = job.get("title", "Unknown")
+            company = job.get("company", "Unknown")
+
+            # Skip if already applied
+            if skip_applied and tracker.is_already_applied(job_id, job.get("link")):
+                log_info(f"  Skipping (already applied): {title} @ {company}")
+                skipped_count += 1
+                APPLY_RESULTS.inc(result="skipped")
+                if retry_queue is not None:
+                    retry_queue.discard(job)
+                if checkpoint is not None:
+                    checkpoint.mark_done(job, "skipped")
+                continue
+
+            # Skip blacklisted companies
+            if company.lower() in blacklist:
+                log_warn(f"  Skipping (blacklisted): {title} @ {company}")
+                skipped_count += 1
+                APPLY_RESULTS.inc(result="skipped")
+                if retry_queue is not None:
+                    retry_queue.discard(job)
+                if checkpoint is not None:
+                    checkpoint.mark_done(job, "skipped")
+                continue
+
+            log_info(f"Applying: {title} @ {company}")
+
+            success, reason = _apply_single_job(driver, job, job_store)
+
+            if success:
+                applied_count += 1
+                APPLY_RESULTS.inc(result="applied")
+                tracker.record({
+                    "job_id": job_id,
+                    "title": title,
+                    "company": company,
+                    "location": job.get("location", ""),
+                    "link": job.get("link", ""),
+                    "date": str(date.today()),
+                    "status": "applied",
+                    "score": job.get("score"),
+                })
+                if near_dupes is not None:
+                    near_dupes.mark_applied(job)
+                if retry_queue is not None:
+                    retry_queue.discard(job)
+                if checkpoint is not None:
+                    checkpoint.mark_done(job, "applied")
+                log_info(f"  Applied successfully ({applied_count}/{max_daily})")
+                if applied_count >= max_daily:
+                    log_warn(f"Reached daily apply limit ({max_daily})")
+                    break
+            else:
+                failed_count += 1
+                APPLY_RESULTS.inc(result="failed")
+                if retry_queue is not None and retry_queue.record_failure(job, reason):
+                    log_warn(f"  Failed to apply ({reason}) — queued for retry")
+                else:
+                    log_warn(f"  Failed to apply ({reason})")
+                if checkpoint is not None:
+                    checkpoint.mark_done(job, reason)
+
+            random_delay(3, 6)
+    finally:
+        tracker.close()
+        if near_dupes is not None:
+            near_dupes.save()
+        if job_store is not None:
+            job_store.save()
+        if retry_queue is not None:
+            retry_queue.save()
+        if checkpoint is not None:
+            checkpoint.close()
+        close = getattr(jobs, "close", None)
+        if close:
+            close()
+
+    if checkpoint is not None:
+        checkpoint.finish()
 
     log_info(f"\nApply session complete: {applied_count} applied, {skipped_count} skipped, {failed_count} failed")
     return {
@@ -161,3 +248,116 @@ def apply_to_jobs(driver, jobs, config):
         "skipped": skipped_count,
         "failed": failed_count,
     }
+
+
+def _retries_first(retries, jobs):
+    """Yield queued retries, then ``jobs``.
+
+    ``jobs`` is only iterated once the retries run out, so a lazy search
+    behind it never starts if the retries use up the daily limit.
+    """
+    try:
+        yield from retries
+        yield from jobs
+    finally:
+        close = getattr(jobs, "close", None)
+        if close:
+            close()
+
+
+def _search_all(driver, config, max_pages, known_keys, near_dupes, job_store, checkpoint=None, queued_keys=frozenset()):
+    """Search every page, then filter and rank the whole result set before yielding it.
+
+    The final plan is written to ``checkpoint``, if given.
+    """
+    log_info("Searching for jobs...")
+    jobs = search_jobs(driver, config, max_pages=max_pages, known_keys=known_keys | queued_keys)
+
+    found = len(jobs)
+    jobs, dropped = filter_jobs(jobs, config, known_keys, queued_keys=queued_keys)
+
+    ranking = config.get("ranking", {}).get("enabled", True)
+    if ranking and jobs:
+        if job_store is not None:
+            # Full descriptions of pages opened on earlier runs score better than card snippets
+            job_store.attach_descriptions(jobs)
+        jobs = rank_jobs(jobs, config)
+
+    if near_dupes is not None:
+        # After ranking, so the best-scoring copy of a repost is the one kept
+        jobs = drop_near_duplicates(jobs, near_dupes, dropped)
+    log_filter_summary(found, jobs, dropped)
+
+    if not jobs:
+        log_info("No jobs found matching your criteria")
+        return
+
+    if ranking:
+        top = ", ".join(f"{job['title']} ({job['score']:.2f})" for job in jobs[:3])
+        log_info(f"Ranked {len(jobs)} jobs by relevance — top: {top}")
+
+    if checkpoint is not None:
+        checkpoint.add_jobs(jobs)
+    log_info(f"Found {len(jobs)} jobs — starting apply cycle")
+    yield from jobs
+
+
+def _resume_session(driver, config, checkpoint, near_dupes, job_store, retry_queue):
+    """Apply to the jobs an interrupted session planned but never reached."""
+    planned = checkpoint.remaining()
+    if planned is None:
+        log_warn("No interrupted session to resume")
+        return {"applied": 0, "skipped": 0, "failed": 0}
+
+    skip_applied = config.get("filters", {}).get("skip_already_applied", True)
+    known_keys = load_applied_keys(get_backend(config)) if skip_applied else set()
+    # Due retries in the plan stay; jobs still on backoff were only found by the search
+    queued_keys = retry_queue.waiting_keys() if retry_queue is not None else set()
+    # Streamed pages were checkpointed before filtering, so filter again
+    jobs, dropped = filter_jobs(planned, config, known_keys, near_dupes, queued_keys)
+    log_filter_summary(len(planned), jobs, dropped)
+    log_info(f"Resuming session: {len(jobs)} jobs left, no search needed")
+    return apply_to_jobs(driver, jobs, config, near_dupes, job_store, retry_queue, checkpoint)
+
+
+def run_apply_cycle(driver, config, max_pages=3, stream=False, resume=False):
+    """Retry due failures, then search, filter and apply in one go on a logged-in driver.
+
+    With ``stream=True`` applying starts after the first results page. The
+    plan and progress are checkpointed; ``resume=True`` continues an
+    interrupted session from its checkpoint instead of searching.
+    Returns the ``apply_to_jobs`` result dict.
+    """
+    near_dupes = NearDuplicateIndex.from_config(config)
+    job_store = JobStore.from_config(config)
+    retry_queue = RetryQueue.from_config(config)
+    checkpoint = SessionCheckpoint()
+
+    if resume:
+        return _resume_session(driver, config, checkpoint, near_dupes, job_store, retry_queue)
+
+    skip_applied = config.get("filters", {}).get("skip_already_applied", True)
+    known_keys = load_applied_keys(get_backend(config)) if skip_applied else set()
+    checkpoint.start()
+
+    retries = []
+    queued_keys = set()
+    if retry_queue is not None:
+        retries = retry_queue.due()
+        retry_queue.log_stats(len(retries))
+        checkpoint.add_jobs(retries)
+        # Queued jobs, due or still on backoff, are applied from the queue, not picked up again by the search
+        queued_keys = retry_queue.keys()
+
+    if stream:
+        log_info("Streaming search results into the apply loop...")
+        pages = iter_job_pages(driver, config, max_pages=max_pages, known_keys=known_keys | queued_keys)
+        if config.get("ranking", {}).get("enabled", True):
+            # Only reorders within each page: the stream never holds more than one page
+            pages = iter_ranked(pages, config)
+        jobs = iter_filtered(checkpoint.iter_planned(pages), config, known_keys, near_dupes, queued_keys)
+    else:
+        jobs = _search_all(driver, config, max_pages, known_keys, near_dupes, job_store, checkpoint, queued_keys)
+
+    return apply_to_jobs(driver, _retries_first(retries, jobs), config, near_dupes, job_store, retry_queue,
+                         checkpoint)
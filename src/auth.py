@@ -1,68 +1,86 @@
 import os
-import pickle
 
 from dotenv import load_dotenv
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
+from src import cookie_store, locators
+from src.cookie_store import is_session_fresh
+from src.metrics import LOGINS
+from src.perf import span, timed
 from src.utils import human_type, log_error, log_info, log_warn, random_delay
+from src.waits import wait_for
 
-load_dotenv()
-
-COOKIES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "cookies.pkl")
 LOGIN_URL = "https://www.naukri.com/nlogin/login"
 HOME_URL = "https://www.naukri.com/mnjuser/homepage"
+BASE_URL = "https://www.naukri.com"
 
 
-def save_cookies(driver):
-    """Save browser cookies to disk."""
-    os.makedirs(os.path.dirname(COOKIES_PATH), exist_ok=True)
-    with open(COOKIES_PATH, "wb") as f:
-        pickle.dump(driver.get_cookies(), f)
-    log_info(f"Cookies saved to {COOKIES_PATH}")
+class SessionLostError(RuntimeError):
+    """The logged-in session was lost mid-run and logging in again failed."""
 
 
-def load_cookies(driver):
-    """Load cookies from disk into the browser session."""
-    if not os.path.exists(COOKIES_PATH):
-        log_warn("No saved cookies found")
-        return False
+def _browser_cookies(driver):
+    """Read all cookies held by the browser without navigating (via CDP)."""
+    try:
+        return driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+    except Exception:
+        return []
 
-    driver.get("https://www.naukri.com")
-    random_delay(2, 4)
 
-    with open(COOKIES_PATH, "rb") as f:
-        cookies = pickle.load(f)
+def save_cookies(driver):
+    """Save the browser's Naukri cookies to the cookie store."""
+    cookies = [cookie for cookie in _browser_cookies(driver) if "naukri" in cookie.get("domain", "")]
+    path = cookie_store.save(cookies or driver.get_cookies())
+    log_info(f"Cookies saved to {path}")
+
+
+def load_cookies(driver, refresh=True):
+    """Load unexpired stored cookies into the browser session.
 
-    for cookie in cookies:
-        try:
-            driver.add_cookie(cookie)
-        except Exception:
-            pass
+    Cookies go in with one CDP ``Network.setCookies`` call, which needs no
+    page load. If CDP is unavailable they are added one by one on the home
+    page instead, followed by a reload when ``refresh`` is set.
+    """
+    cookies = cookie_store.live_cookies(cookie_store.read())
+    if not cookies:
+        log_warn("No saved cookies found")
+        return False
 
-    driver.refresh()
-    random_delay(2, 4)
-    log_info("Cookies loaded from disk")
+    try:
+        driver.execute_cdp_cmd("Network.setCookies", {
+            "cookies": [cookie if "domain" in cookie else {**cookie, "url": BASE_URL} for cookie in cookies],
+        })
+    except Exception as e:
+        log_warn(f"Bulk cookie restore failed, adding cookies one by one: {e}")
+        with span("driver.get:home"):
+            driver.get(BASE_URL)
+        random_delay(2, 4)
+        for cookie in cookies:
+            try:
+                selenium_cookie = {key: value for key, value in cookie.items() if key != "expires"}
+                if "expires" in cookie:
+                    selenium_cookie["expiry"] = int(cookie["expires"])
+                driver.add_cookie(selenium_cookie)
+            except Exception:
+                pass
+        if refresh:
+            with span("driver.refresh"):
+                driver.refresh()
+            random_delay(2, 4)
+
+    log_info(f"Loaded {len(cookies)} cookies from disk")
     return True
 
 
 def is_logged_in(driver):
     """Check if the user is currently logged in."""
     try:
-        driver.get(HOME_URL)
+        with span("driver.get:homepage"):
+            driver.get(HOME_URL)
         random_delay(3, 5)
         # Check multiple indicators of logged-in state
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR,
-                ".nI-gNb-drawer__hamburger, "
-                ".view-profile-wrapper, "
-                "a[href*='mnjuser/profile'], "
-                "[class*='user-name'], "
-                ".nI-gNb-header__wrapper, "
-                "#root .dashboard-container"
-            ))
-        )
+        locators.wait_for_locator(driver, "auth.logged_in", timeout=10)
         # Also verify we weren't redirected back to login
         if "nlogin/login" in driver.current_url:
             log_warn("Redirected to login page — not logged in")
@@ -74,49 +92,77 @@ def is_logged_in(driver):
         return False
 
 
-def login(driver):
-    """Login to Naukri using credentials from .env. Tries cookies first."""
-    # Try cookie-based session restoration first
-    if os.path.exists(COOKIES_PATH):
+@timed("login")
+def login(driver, fresh=False):
+    """Login to Naukri using credentials from .env. Tries cookies first.
+
+    Sessions whose cookies are known to be valid (already in a persistent
+    browser profile, or stored on disk) are trusted without loading the
+    homepage to verify them. ``fresh=True`` skips cookies entirely, for when
+    a restored session has just been seen not to work.
+    """
+    # A persistent profile may already hold a live session — no navigation needed
+    if not fresh and is_session_fresh(_browser_cookies(driver)):
+        log_info("Browser profile session is still valid — skipping login check")
+        LOGINS.inc(path="browser_profile")
+        return True
+
+    # Try cookie-based session restoration first; the stored expiries say
+    # whether it can work before any page is loaded
+    stored = [] if fresh else cookie_store.read()
+    state = cookie_store.session_state(stored) if stored else None
+    if state == "fresh":
+        log_info("Restoring unexpired session from cookies...")
+        load_cookies(driver, refresh=False)
+        LOGINS.inc(path="cookie")
+        return True
+
+    if state == "expired":
+        log_info("Stored session has expired — skipping cookie restore")
+    elif state == "unknown":
         log_info("Attempting session restore from cookies...")
-        load_cookies(driver)
-        if is_logged_in(driver):
+        if load_cookies(driver) and is_logged_in(driver):
+            LOGINS.inc(path="cookie_verified")
             return True
 
     # Fresh login
+    load_dotenv()
     email = os.getenv("NAUKRI_EMAIL", "").strip()
     password = os.getenv("NAUKRI_PASSWORD", "").strip()
 
     if not email or not password:
         log_error("Missing NAUKRI_EMAIL or NAUKRI_PASSWORD in .env file")
+        LOGINS.inc(path="failed")
         return False
 
     log_info(f"Performing fresh login for {email}...")
-    driver.get(LOGIN_URL)
+    with span("driver.get:login"):
+        driver.get(LOGIN_URL)
     random_delay(3, 5)
 
     try:
-        wait = WebDriverWait(driver, 15)
-
         # Enter email
-        email_field = wait.until(
-            EC.presence_of_element_located((By.ID, "usernameField"))
+        email_field = wait_for(
+            driver, EC.presence_of_element_located((By.ID, "usernameField")), timeout=15, label="email field"
         )
         email_field.clear()
         human_type(email_field, email)
         random_delay(1, 2)
 
         # Enter password
-        password_field = wait.until(
-            EC.presence_of_element_located((By.ID, "passwordField"))
+        password_field = wait_for(
+            driver, EC.presence_of_element_located((By.ID, "passwordField")), timeout=15, label="password field"
         )
         password_field.clear()
         human_type(password_field, password)
         random_delay(1, 2)
 
         # Click the Login button (not the search submit)
-        login_btn = wait.until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@type='submit' and contains(text(),'Login')]"))
+        login_btn = wait_for(
+            driver,
+            EC.element_to_be_clickable((By.XPATH, "//button[@type='submit' and contains(text(),'Login')]")),
+            timeout=15,
+            label="login button",
         )
         login_btn.click()
         random_delay(5, 8)
@@ -128,13 +174,16 @@ def login(driver):
         if is_logged_in(driver):
             save_cookies(driver)
             log_info("Login successful!")
+            LOGINS.inc(path="fresh")
             return True
         else:
             log_error("Login failed — could not verify session")
             driver.save_screenshot("/tmp/naukri_login_failed.png")
+            LOGINS.inc(path="failed")
             return False
 
     except Exception as e:
         log_error(f"Login failed: {e}")
         driver.save_screenshot("/tmp/naukri_login_error.png")
+        LOGINS.inc(path="failed")
         return False
@@ -1,30 +1,168 @@
+import json
+import os
 import re
+import shutil
 import subprocess
+import time
 
 import undetected_chromedriver as uc
 
-from src.utils import log_info, setup_logger
+from src.utils import log_info, log_warn
 
-logger = setup_logger()
+ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
+CHROME_VERSION_CACHE = os.path.join(ROOT_DIR, "data", "chrome_version.json")
+CHROME_BINARY = "google-chrome"
+
+# URL patterns blocked for each resource type listed in browser.block_resource_types
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.ogg"],
+}
+
+# Page timing for the current document, from the Performance API. Its
+# transferSize is 0 for cross-origin responses without Timing-Allow-Origin,
+# so bytes are only a fallback for when the performance log is unavailable.
+_PAGE_STATS_JS = """
+const nav = performance.getEntriesByType("navigation")[0] || {};
+const resources = performance.getEntriesByType("resource");
+const bytes = resources.reduce((sum, r) => sum + (r.transferSize || 0), nav.transferSize || 0);
+return {
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd || 0,
+    load_ms: nav.loadEventEnd || 0,
+    requests: resources.length + 1,
+    bytes: bytes,
+};
+"""
+
+
+def _network_log_totals(driver):
+    """Sum requests and encoded bytes from the CDP events in the performance log since the last read.
+
+    Returns None if the driver wasn't created with ``capture_network=True``.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return None
+    requests = 0
+    total_bytes = 0
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") == "Network.loadingFinished":
+            requests += 1
+            total_bytes += message.get("params", {}).get("encodedDataLength", 0)
+    return {"requests": requests, "bytes": total_bytes}
 
 
 def _get_chrome_major_version():
-    """Detect the installed Chrome major version."""
+    """Detect the installed Chrome major version.
+
+    The result is cached in ``data/chrome_version.json`` keyed on the binary's
+    path and mtime, so ``google-chrome --version`` only runs after an upgrade.
+    """
+    binary = shutil.which(CHROME_BINARY)
+    if not binary:
+        return None
+    binary = os.path.realpath(binary)
+    mtime = os.path.getmtime(binary)
+
+    try:
+        with open(CHROME_VERSION_CACHE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("binary") == binary and cached.get("mtime") == mtime:
+            return cached.get("version")
+    except (OSError, ValueError):
+        pass
+
+    version = None
     try:
         output = subprocess.check_output(
-            ["google-chrome", "--version"], stderr=subprocess.DEVNULL, text=True
+            [binary, "--version"], stderr=subprocess.DEVNULL, text=True
         )
         match = re.search(r"(\d+)\.", output)
         if match:
-            return int(match.group(1))
+            version = int(match.group(1))
     except Exception:
         pass
-    return None
 
+    if version:
+        os.makedirs(os.path.dirname(CHROME_VERSION_CACHE), exist_ok=True)
+        with open(CHROME_VERSION_CACHE, "w", encoding="utf-8") as f:
+            json.dump({"binary": binary, "mtime": mtime, "version": version}, f)
+    return version
+
+
+def _resolve_path(path):
+    return path if os.path.isabs(path) else os.path.join(ROOT_DIR, path)
 
-def create_driver(headless=True):
-    """Create an undetected Chrome driver with anti-detection settings."""
+
+def blocked_url_patterns(browser_config):
+    """Combine ``blocked_url_patterns`` and ``block_resource_types`` into one list."""
+    patterns = list(browser_config.get("blocked_url_patterns", []))
+    for resource_type in browser_config.get("block_resource_types", []):
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+    return patterns
+
+
+def set_blocked_urls(driver, patterns):
+    """Block requests matching ``patterns`` via CDP (an empty list unblocks)."""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        return True
+    except Exception as e:
+        log_warn(f"Could not set blocked URLs: {e}")
+        return False
+
+
+def measure_page_load(driver, url, settle_timeout=30):
+    """Load ``url`` with a cold cache and return its load statistics.
+
+    ``wall_ms`` is how long ``driver.get`` blocked (what the bot pays); the
+    other figures are read once the page has fully loaded so byte counts are
+    comparable between profiles. Requests and bytes come from
+    ``Network.loadingFinished`` events (``encodedDataLength``, which counts
+    cross-origin responses too) when the driver captures the network.
+    """
+    driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+    # Drop events from earlier loads
+    _network_log_totals(driver)
+    started = time.perf_counter()
+    driver.get(url)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    deadline = time.time() + settle_timeout
+    while time.time() < deadline and driver.execute_script("return document.readyState") != "complete":
+        time.sleep(0.2)
+
+    stats = driver.execute_script(_PAGE_STATS_JS)
+    stats["wall_ms"] = wall_ms
+    network = _network_log_totals(driver)
+    if network and network["requests"]:
+        stats.update(network)
+    return stats
+
+
+def create_driver(headless=True, browser_config=None, capture_network=False):
+    """Create an undetected Chrome driver with anti-detection settings.
+
+    ``browser_config`` is the ``browser`` section of config.json. Setting
+    ``user_data_dir`` there keeps a persistent Chrome profile (and its
+    cookies) between runs. ``page_load_strategy`` (default ``"eager"``) makes
+    ``driver.get`` return at DOMContentLoaded, and ``blocked_url_patterns`` /
+    ``block_resource_types`` stop unused assets from loading at all.
+    ``capture_network`` records CDP network events in the performance log,
+    for ``measure_page_load``.
+    """
+    browser_config = browser_config or {}
     options = uc.ChromeOptions()
+    options.page_load_strategy = browser_config.get("page_load_strategy", "eager")
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
     if headless:
         options.add_argument("--headless=new")
@@ -40,13 +178,25 @@ def create_driver(headless=True):
     if version:
         log_info(f"Detected Chrome version: {version}")
 
+    user_data_dir = browser_config.get("user_data_dir")
+    if user_data_dir:
+        user_data_dir = _resolve_path(user_data_dir)
+        os.makedirs(user_data_dir, exist_ok=True)
+        log_info(f"Using persistent browser profile: {user_data_dir}")
+
     driver = uc.Chrome(
         options=options,
         use_subprocess=True,
         version_main=version,
+        user_data_dir=user_data_dir,
     )
     driver.set_page_load_timeout(30)
-    driver.implicitly_wait(10)
+    # No implicit wait: lookups use explicit timeouts from src.waits
+    driver.implicitly_wait(0)
+
+    patterns = blocked_url_patterns(browser_config)
+    if patterns and set_blocked_urls(driver, patterns):
+        log_info(f"Blocking {len(patterns)} URL patterns")
 
     log_info("Browser launched successfully")
     return driver
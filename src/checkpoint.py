@@ -0,0 +1,96 @@
+"""Append-only checkpoint of an apply session, so a killed run can resume.
+
+``data/session_checkpoint.jsonl`` holds one JSON record per line:
+
+- ``{"type": "start", "time": ...}`` opens a session (and truncates the file)
+- ``{"type": "jobs", "jobs": [...]}`` adds planned jobs (the batch search
+  result, a streamed page, or due retries)
+- ``{"type": "done", "key": ..., "result": ...}`` marks one job processed
+
+Appending a line per job is cheap, and a line cut short by a crash is
+ignored on load. The file is removed when a session finishes normally, so
+``main.py apply --resume`` only ever picks up an interrupted one.
+"""
+
+import json
+import os
+import time
+
+from src.filters import JOB_FIELDS, job_key
+from src.tracker import DATA_DIR
+from src.utils import log_warn
+
+CHECKPOINT_FILE = os.path.join(DATA_DIR, "session_checkpoint.jsonl")
+
+
+class SessionCheckpoint:
+    def __init__(self, path=CHECKPOINT_FILE):
+        self.path = path
+        self._file = None
+
+    def _append(self, record):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        # Flushed, not fsynced: this only has to survive the process, not the machine
+        self._file.flush()
+
+    def start(self):
+        """Begin a new session, discarding any previous checkpoint."""
+        self.close()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "start", "time": time.time()}) + "\n")
+
+    def add_jobs(self, jobs):
+        if jobs:
+            self._append({
+                "type": "jobs",
+                "jobs": [{field: job[field] for field in JOB_FIELDS if field in job} for job in jobs],
+            })
+
+    def iter_planned(self, pages):
+        """Record each page of a streamed search (see ``iter_job_pages``) as it passes through."""
+        try:
+            for page_jobs in pages:
+                self.add_jobs(page_jobs)
+                yield page_jobs
+        finally:
+            close = getattr(pages, "close", None)
+            if close:
+                close()
+
+    def mark_done(self, job, result):
+        self._append({"type": "done", "key": job_key(job), "result": result})
+
+    def remaining(self):
+        """Return planned jobs not yet marked done, in plan order, or None if there is no checkpoint."""
+        if not os.path.exists(self.path):
+            return None
+        planned = {}
+        done = set()
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    log_warn("Ignoring a truncated line in the session checkpoint")
+                    continue
+                if record.get("type") == "jobs":
+                    for job in record["jobs"]:
+                        planned.setdefault(job_key(job), job)
+                elif record.get("type") == "done":
+                    done.add(record["key"])
+        return [job for key, job in planned.items() if key not in done]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def finish(self):
+        """End the session normally; there is nothing left to resume."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
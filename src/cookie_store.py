@@ -0,0 +1,122 @@
+"""Cookie store: the saved Naukri session as JSON with expiry metadata.
+
+Cookies are normalized to the Chrome DevTools ``Network.CookieParam`` shape
+(``expires`` in epoch seconds, absent for session cookies), so a restore is
+one ``Network.setCookies`` call with expired entries already dropped. The
+file also records the session cookies' expiry range, which lets ``login``
+tell a certainly-expired session from one worth restoring without loading
+a page. A legacy ``cookies.pkl`` is migrated on first read.
+"""
+
+import json
+import os
+import pickle
+import time
+
+from src.tracker import DATA_DIR
+from src.utils import log_info
+
+COOKIES_FILE = os.path.join(DATA_DIR, "cookies.json")
+LEGACY_COOKIES_FILE = os.path.join(DATA_DIR, "cookies.pkl")
+
+# Cookies that carry the logged-in session; their expiry decides whether a
+# stored session can be trusted without loading a page to check it.
+SESSION_COOKIE_NAMES = ("nauk_at", "nauk_rt", "nauk_sid")
+SESSION_EXPIRY_MARGIN = 10 * 60
+
+_CDP_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+
+
+def expires_at(cookie):
+    """Expiry in epoch seconds, or None for a session cookie."""
+    expiry = cookie.get("expires", cookie.get("expiry"))
+    return expiry if expiry and expiry > 0 else None
+
+
+def normalize(cookie):
+    """Convert a Selenium or CDP cookie dict to the stored ``CookieParam`` shape."""
+    normalized = {field: cookie[field] for field in _CDP_FIELDS if cookie.get(field) is not None}
+    normalized.pop("expires", None)
+    expiry = expires_at(cookie)
+    if expiry is not None:
+        normalized["expires"] = expiry
+    return normalized
+
+
+def live_cookies(cookies, now=None):
+    """Drop cookies that have already expired."""
+    now = time.time() if now is None else now
+    return [cookie for cookie in cookies if (expires_at(cookie) or float("inf")) > now]
+
+
+def session_expiry(cookies):
+    """Return the earliest expiry (epoch seconds) among the session cookies.
+
+    Returns None if no session cookie with an expiry is present.
+    """
+    expiries = [expires_at(cookie) for cookie in cookies if cookie.get("name") in SESSION_COOKIE_NAMES]
+    expiries = [e for e in expiries if e]
+    return min(expiries) if expiries else None
+
+
+def is_session_fresh(cookies, margin=SESSION_EXPIRY_MARGIN):
+    """True if the session cookies are present and not about to expire."""
+    expiry = session_expiry(cookies)
+    return expiry is not None and expiry > time.time() + margin
+
+
+def session_state(cookies, margin=SESSION_EXPIRY_MARGIN):
+    """Classify a stored session without loading a page.
+
+    ``"fresh"``: every session cookie outlives ``margin``. ``"expired"``: every
+    session cookie has expired, so restoring can't work. ``"unknown"``:
+    anything in between, or no session cookies with an expiry; only loading
+    a page can tell.
+    """
+    expiries = [expires_at(cookie) for cookie in cookies if cookie.get("name") in SESSION_COOKIE_NAMES]
+    if not expiries or None in expiries:
+        return "unknown"
+    now = time.time()
+    if min(expiries) > now + margin:
+        return "fresh"
+    if max(expiries) <= now:
+        return "expired"
+    return "unknown"
+
+
+def _migrate_legacy():
+    try:
+        with open(LEGACY_COOKIES_FILE, "rb") as f:
+            cookies = pickle.load(f)
+    except Exception:
+        return []
+    save(cookies)
+    os.remove(LEGACY_COOKIES_FILE)
+    log_info(f"Migrated saved cookies to {COOKIES_FILE}")
+    return read()
+
+
+def read():
+    """Return every stored cookie, expired ones included."""
+    if not os.path.exists(COOKIES_FILE):
+        return _migrate_legacy() if os.path.exists(LEGACY_COOKIES_FILE) else []
+    try:
+        with open(COOKIES_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("cookies", [])
+    except (OSError, ValueError):
+        return []
+
+
+def save(cookies):
+    """Store ``cookies`` (Selenium or CDP dicts) atomically with expiry metadata."""
+    cookies = [normalize(cookie) for cookie in cookies]
+    os.makedirs(os.path.dirname(COOKIES_FILE), exist_ok=True)
+    tmp_path = COOKIES_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "saved_at": time.time(),
+            "session_expiry": session_expiry(cookies),
+            "cookies": cookies,
+        }, f, indent=2)
+    os.replace(tmp_path, COOKIES_FILE)
+    return COOKIES_FILE
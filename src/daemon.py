@@ -0,0 +1,211 @@
+"""Long-running daemon: one warm browser, an internal scheduler and a local control endpoint.
+
+Endpoints (bound to localhost by default):
+
+    GET  /health         driver status
+    GET  /stats          daemon counters, last results and tracker stats
+    POST /run/apply      queue an apply cycle
+    POST /run/refresh    queue a profile refresh
+"""
+
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src import perf
+from src.apply import run_apply_cycle
+from src.auth import login
+from src.locators import save_stats as save_locator_stats
+from src.profile import refresh_profile
+from src.supervisor import SupervisedDriver, browser_rss_mb
+from src.tracker import get_backend
+from src.utils import log_error, log_info, log_warn
+
+DEFAULTS = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "apply_every_minutes": 240,
+    "refresh_every_minutes": 720,
+    "max_pages": 3,
+    "stream": True,
+    "health_check_seconds": 60,
+}
+
+
+class Daemon:
+    """Keeps one logged-in driver alive and runs tasks from a schedule or on request."""
+
+    def __init__(self, config, headless=True):
+        self.config = config
+        self.headless = headless
+        self.settings = {**DEFAULTS, **config.get("daemon", {})}
+        self.driver = None
+        self.tasks = queue.Queue()
+        self.stats = {
+            "started_at": time.time(),
+            "driver_launches": 0,
+            "runs": {"apply": 0, "refresh": 0},
+            "last_run": {},
+            "last_apply_results": None,
+            "last_error": None,
+        }
+        self._stop = threading.Event()
+        self._server = None
+
+    # -- driver lifecycle -------------------------------------------------
+
+    def _launch_driver(self):
+        self._quit_driver()
+        self.driver = SupervisedDriver.from_config(self.config, headless=self.headless)
+        self.stats["driver_launches"] += 1
+        if not login(self.driver):
+            raise RuntimeError("login failed")
+
+    def _quit_driver(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def driver_healthy(self):
+        """True if the browser answers commands.
+
+        A browser past the supervisor's memory or page limits is recycled
+        here, between tasks, with its session carried over.
+        """
+        if self.driver is None:
+            return False
+        try:
+            self.driver.execute_script("return 1")
+            self.driver.maybe_recycle(sample_memory=True)
+        except Exception as e:
+            log_warn(f"Browser not responding: {e}")
+            return False
+        return True
+
+    def ensure_driver(self):
+        if not self.driver_healthy():
+            log_info("Launching browser for daemon...")
+            self._launch_driver()
+
+    # -- tasks ------------------------------------------------------------
+
+    def run_task(self, name):
+        log_info(f"Daemon: running {name}")
+        # Spans are per task: the daemon never exits, so they would pile up otherwise
+        perf.reset()
+        try:
+            self.ensure_driver()
+            if name == "apply":
+                self.stats["last_apply_results"] = run_apply_cycle(
+                    self.driver, self.config,
+                    max_pages=self.settings["max_pages"],
+                    stream=self.settings["stream"],
+                )
+            elif name == "refresh":
+                refresh_profile(self.driver)
+            self.stats["runs"][name] += 1
+        except Exception as e:
+            log_error(f"Daemon: {name} failed: {e}")
+            self.stats["last_error"] = f"{name}: {e}"
+            # Assume the browser is in a bad state; relaunch before the next task
+            self._quit_driver()
+        finally:
+            self.stats["last_run"][name] = time.time()
+            save_locator_stats()
+            try:
+                perf.write_report(extra={"task": name})
+            except OSError as e:
+                log_warn(f"Could not write performance report: {e}")
+            perf.reset()
+
+    def snapshot(self):
+        stats = dict(self.stats)
+        stats["tracker"] = get_backend(self.config).get_stats()
+        stats["browser_rss_mb"] = browser_rss_mb(self.driver) if self.driver else None
+        stats["supervisor"] = dict(self.driver.stats) if self.driver else None
+        return stats
+
+    # -- main loop --------------------------------------------------------
+
+    def serve_forever(self):
+        self._start_http()
+
+        intervals = {
+            "apply": self.settings["apply_every_minutes"] * 60,
+            "refresh": self.settings["refresh_every_minutes"] * 60,
+        }
+        next_due = {name: time.time() for name, every in intervals.items() if every}
+        next_health = time.time() + self.settings["health_check_seconds"]
+
+        log_info(f"Daemon started — schedule: {intervals}")
+        try:
+            while not self._stop.is_set():
+                now = time.time()
+                wake_at = min(list(next_due.values()) + [next_health])
+                try:
+                    name = self.tasks.get(timeout=max(0.0, wake_at - now))
+                    self.run_task(name)
+                    continue
+                except queue.Empty:
+                    pass
+
+                now = time.time()
+                for name, due in next_due.items():
+                    if now >= due:
+                        self.run_task(name)
+                        next_due[name] = time.time() + intervals[name]
+
+                if time.time() >= next_health:
+                    if self.driver is not None and not self.driver_healthy():
+                        self._quit_driver()
+                    next_health = time.time() + self.settings["health_check_seconds"]
+        finally:
+            self.stop()
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server = None
+        self._quit_driver()
+
+    def _start_http(self):
+        daemon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, payload):
+                body = json.dumps(payload, default=str).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._reply(200, {"driver_alive": daemon.driver is not None})
+                elif self.path == "/stats":
+                    self._reply(200, daemon.snapshot())
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                task = self.path.rsplit("/", 1)[-1]
+                if self.path.startswith("/run/") and task in ("apply", "refresh"):
+                    daemon.tasks.put(task)
+                    self._reply(202, {"queued": task})
+                else:
+                    self._reply(404, {"error": "not found"})
+
+            def log_message(self, format, *args):
+                pass
+
+        host, port = self.settings["host"], self.settings["port"]
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        log_info(f"Control endpoint listening on http://{host}:{port}")
@@ -0,0 +1,182 @@
+"""Near-duplicate job detection with MinHash + LSH.
+
+The same role is often posted several times under different job IDs:
+reposts, one listing per city, slightly reworded titles. Each posting is
+reduced to word shingles of its normalized title and hashed into a MinHash
+signature. The card snippet is left out: Naukri cards share so much
+boilerplate and so many tags that it swamped the title. Location is left
+out on purpose.
+
+An LSH index over signature bands, keyed by the normalized company as
+well, finds candidates in constant time per job. Only postings from the
+same company can collide. Each candidate is confirmed by the exact
+Jaccard similarity of the shingle sets, so MinHash estimation error can
+only cost a missed duplicate, never a dropped distinct job.
+
+Shingles of applied jobs persist in ``data/near_dupes.json`` next to the
+tracker, so reposts of roles applied to on earlier days are caught as well.
+"""
+
+import json
+import os
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+from src.filters import job_key
+from src.tracker import DATA_DIR
+
+INDEX_FILE = os.path.join(DATA_DIR, "near_dupes.json")
+
+_PRIME = (1 << 31) - 1
+_SEED = 1729
+_FORMAT = 2
+
+# Words that vary between reposts of the same role without changing it
+_NOISE_WORDS = {
+    "urgent", "urgently", "hiring", "immediate", "immediately", "joiner", "joiners",
+    "opening", "openings", "requirement", "required", "wanted", "walk", "walkin",
+    "pvt", "ltd", "private", "limited", "llp", "inc", "the", "for", "and", "with", "in",
+}
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def normalize(text):
+    return [word for word in _WORD_RE.findall((text or "").lower()) if word not in _NOISE_WORDS]
+
+
+def shingles(job, size=2):
+    """Word shingles over the normalized title."""
+    words = normalize(job.get("title", ""))
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def company_key(job):
+    return " ".join(normalize(job.get("company", "")))
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of job postings.
+
+    Jobs seen in the current run are indexed in memory; only jobs passed to
+    ``mark_applied`` are written to disk by ``save``.
+    """
+
+    def __init__(self, path=INDEX_FILE, threshold=0.7, num_perm=64, bands=16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.path = path
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = np.random.default_rng(_SEED)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.int64)
+
+        self._shingles = {}
+        self._companies = {}
+        self._persisted = set()
+        self._buckets = [defaultdict(list) for _ in range(bands)]
+        self._load()
+
+    @classmethod
+    def from_config(cls, config):
+        dedupe_cfg = config.get("dedupe", {})
+        if not dedupe_cfg.get("enabled", True):
+            return None
+        return cls(threshold=dedupe_cfg.get("threshold", 0.7))
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("format") != _FORMAT:
+            # Older files hold signatures only, which can't be confirmed exactly
+            return
+        for key, entry in data.get("jobs", {}).items():
+            self._insert(key, entry["company"], set(entry["shingles"]))
+            self._persisted.add(key)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        data = {
+            "format": _FORMAT,
+            "jobs": {
+                key: {"company": self._companies[key], "shingles": sorted(self._shingles[key])}
+                for key in self._persisted
+            },
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def signature(self, job_shingles):
+        hashes = np.array(
+            [zlib.crc32(shingle.encode("utf-8")) for shingle in job_shingles] or [0],
+            dtype=np.int64,
+        )
+        return ((self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _band_keys(self, company, signature):
+        prefix = company.encode("utf-8") + b"\0"
+        return [prefix + signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, key, company, job_shingles, band_keys=None):
+        self._shingles[key] = job_shingles
+        self._companies[key] = company
+        if band_keys is None:
+            band_keys = self._band_keys(company, self.signature(job_shingles))
+        for band, band_key in enumerate(band_keys):
+            self._buckets[band][band_key].append(key)
+
+    def find_duplicate(self, job_shingles, band_keys, exclude=None):
+        """Return the key of an indexed near-duplicate sharing a band key, or None."""
+        candidates = set()
+        for band, band_key in enumerate(band_keys):
+            candidates.update(self._buckets[band].get(band_key, ()))
+        candidates.discard(exclude)
+        for candidate in candidates:
+            if jaccard(self._shingles[candidate], job_shingles) >= self.threshold:
+                return candidate
+        return None
+
+    def check_and_add(self, job):
+        """Return the key this job duplicates, or index it and return None."""
+        key = job_key(job)
+        if not key:
+            return None
+        if key in self._shingles:
+            return None
+        job_shingles = shingles(job)
+        if not job_shingles:
+            return None
+        company = company_key(job)
+        band_keys = self._band_keys(company, self.signature(job_shingles))
+        duplicate_of = self.find_duplicate(job_shingles, band_keys, exclude=key)
+        if duplicate_of is None:
+            self._insert(key, company, job_shingles, band_keys)
+        return duplicate_of
+
+    def mark_applied(self, job):
+        """Persist this job's shingles on the next ``save``."""
+        key = job_key(job)
+        if not key:
+            return
+        if key not in self._shingles:
+            self._insert(key, company_key(job), shingles(job))
+        self._persisted.add(key)
@@ -0,0 +1,155 @@
+"""Pre-apply filtering stage between search and apply.
+
+Drops already-applied, blacklisted, out-of-range-experience and (optionally)
+near-duplicate jobs in a single pass, before any job page is visited.
+"""
+
+import re
+from collections import Counter
+
+from src.utils import log_info
+
+_RANGE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)")
+_SINGLE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\+?\s*(?:yrs?|years?)", re.IGNORECASE)
+
+
+def parse_experience(text):
+    """Parse a card's experience text (e.g. ``"0-2 Yrs"``) into ``(min, max)``.
+
+    Returns None when the text has no recognisable range.
+    """
+    if not text:
+        return None
+    if "fresher" in text.lower():
+        return (0.0, 0.0)
+    match = _RANGE_RE.search(text)
+    if match:
+        return (float(match.group(1)), float(match.group(2)))
+    match = _SINGLE_RE.search(text)
+    if match:
+        value = float(match.group(1))
+        return (value, value)
+    return None
+
+
+# Card fields persisted for a job (checkpoint plan, retry queue); enough to filter, rank and apply again
+JOB_FIELDS = ("job_id", "title", "company", "location", "experience", "link", "snippet", "score")
+
+
+def job_key(job):
+    """Return the single key a job is stored under: its job_id, else its link."""
+    return job.get("job_id") or job.get("link", "")
+
+
+def job_keys(job):
+    """Return the identifiers a job can be matched on in tracker history."""
+    return {key for key in (job.get("job_id"), job.get("link")) if key}
+
+
+def is_known(job, known_keys):
+    return not job_keys(job).isdisjoint(known_keys)
+
+
+def filter_jobs(jobs, config, known_keys=(), near_dupes=None, queued_keys=()):
+    """Drop jobs that the apply loop would skip anyway.
+
+    ``queued_keys`` holds jobs on the retry queue; they are retried from the
+    queue on their own schedule, not when a search finds them again.
+
+    ``near_dupes`` is an optional ``NearDuplicateIndex``; jobs it flags as
+    reposts of a job seen in this run or applied to before are dropped too.
+    The first copy seen is kept, so rank ``jobs`` first, or leave
+    ``near_dupes`` out and call ``drop_near_duplicates`` after ranking.
+
+    Returns ``(kept_jobs, dropped)`` where ``dropped`` is a Counter keyed by
+    reason: ``queued_retry``, ``already_applied``, ``blacklisted``,
+    ``experience``, ``near_duplicate``.
+    """
+    filters = config.get("filters", {})
+    skip_applied = filters.get("skip_already_applied", True)
+    blacklist = {c.lower() for c in filters.get("blacklist_companies", [])}
+
+    experience = config.get("search", {}).get("experience", {})
+    exp_min = experience.get("min")
+    exp_max = experience.get("max")
+
+    if not skip_applied:
+        known = set()
+    elif isinstance(known_keys, (set, frozenset)):
+        known = known_keys
+    else:
+        known = set(known_keys)
+    kept = []
+    dropped = Counter()
+
+    for job in jobs:
+        if queued_keys and is_known(job, queued_keys):
+            dropped["queued_retry"] += 1
+            continue
+
+        if known and is_known(job, known):
+            dropped["already_applied"] += 1
+            continue
+
+        if job.get("company", "").lower() in blacklist:
+            dropped["blacklisted"] += 1
+            continue
+
+        job_range = parse_experience(job.get("experience", ""))
+        if job_range is not None:
+            job_min, job_max = job_range
+            if (exp_max is not None and job_min > exp_max) or (exp_min is not None and job_max < exp_min):
+                dropped["experience"] += 1
+                continue
+
+        if near_dupes is not None and near_dupes.check_and_add(job) is not None:
+            dropped["near_duplicate"] += 1
+            continue
+
+        kept.append(job)
+
+    return kept, dropped
+
+
+def drop_near_duplicates(jobs, near_dupes, dropped):
+    """Drop jobs ``near_dupes`` flags as reposts, counting them in ``dropped``.
+
+    The first of a group of reposts is kept, so pass ``jobs`` best-first.
+    """
+    kept = []
+    for job in jobs:
+        if near_dupes.check_and_add(job) is not None:
+            dropped["near_duplicate"] += 1
+            continue
+        kept.append(job)
+    return kept
+
+
+def _format_dropped(dropped):
+    return ", ".join(f"{reason}: {count}" for reason, count in dropped.most_common()) or "none"
+
+
+def log_filter_summary(total, kept, dropped):
+    log_info(f"Filtered {total} jobs -> {len(kept)} to apply (dropped {_format_dropped(dropped)})")
+
+
+def iter_filtered(pages, config, known_keys=(), near_dupes=None, queued_keys=()):
+    """Filter a stream of job pages (see ``iter_job_pages``), yielding jobs one by one.
+
+    Logs the per-reason drop summary once the stream ends or is closed.
+    """
+    total = 0
+    kept_count = 0
+    dropped = Counter()
+    try:
+        for page_jobs in pages:
+            kept, page_dropped = filter_jobs(page_jobs, config, known_keys, near_dupes, queued_keys)
+            total += len(page_jobs)
+            kept_count += len(kept)
+            dropped.update(page_dropped)
+            yield from kept
+    finally:
+        close = getattr(pages, "close", None)
+        if close:
+            close()
+        log_info(f"Streamed {total} jobs -> {kept_count} passed filters (dropped {_format_dropped(dropped)})")
@@ -0,0 +1,193 @@
+"""Local store of job detail pages.
+
+When the apply loop opens a job page, its description text and key
+metadata are saved here so scoring, reporting and retries can reuse them
+without loading the page again. Descriptions are content-addressed (a
+repost with identical text shares one blob) and gzip-compressed; per-posting
+metadata such as the link and location lives in the index, so it doesn't
+change the hash. The store is bounded by total compressed bytes with
+least-recently-used eviction.
+
+Layout::
+
+    data/job_details/index.json        job_id -> hash, size, metadata, last_used
+    data/job_details/<sha256>.json.gz  {"description": ..., "skills": [...]}
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+
+from src.tracker import DATA_DIR
+
+STORE_DIR = os.path.join(DATA_DIR, "job_details")
+
+# Page content shared by reposts; everything else is per-posting metadata
+_BLOB_FIELDS = ("description", "skills")
+
+# Reads the description and metadata of a job detail page in one round-trip
+EXTRACT_DETAIL_JS = """
+const text = (sel) => {
+    const el = document.querySelector(sel);
+    return el ? el.innerText.trim() : "";
+};
+return {
+    description: text(".styles_JDC__dang-inner-html, [class*='JDC__dang-inner-html'], .job-desc, [class*='job-description']"),
+    title: text("h1, [class*='jd-header-title']"),
+    company: text("[class*='jd-header-comp-name'] a, [class*='jd-header-comp-name']"),
+    experience: text("[class*='jhc__exp']"),
+    salary: text("[class*='jhc__salary']"),
+    location: text("[class*='jhc__location']"),
+    skills: Array.from(document.querySelectorAll("[class*='key-skill'] a, [class*='key-skill'] span"))
+        .map(el => el.innerText.trim()).filter(Boolean),
+};
+"""
+
+
+class JobStore:
+    def __init__(self, directory=STORE_DIR, max_bytes=50 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self._index = self._load_index()
+        self._dirty = False
+
+        # hash -> [size, referencing entries], so eviction keeps a running total
+        self._blobs = {}
+        self._total_bytes = 0
+        for entry in self._index.values():
+            self._add_ref(entry["hash"], entry["size"])
+
+    @classmethod
+    def from_config(cls, config):
+        store_cfg = config.get("job_store", {})
+        if not store_cfg.get("enabled", True):
+            return None
+        return cls(max_bytes=int(store_cfg.get("max_mb", 50) * 1024 * 1024))
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
+
+    def _blob_path(self, content_hash):
+        return os.path.join(self.directory, f"{content_hash}.json.gz")
+
+    def _add_ref(self, content_hash, size):
+        blob = self._blobs.setdefault(content_hash, [size, 0])
+        if blob[1] == 0:
+            self._total_bytes += size
+        blob[1] += 1
+
+    def _drop_ref(self, content_hash):
+        """Release one reference; delete the blob once nothing points at it."""
+        blob = self._blobs.get(content_hash)
+        if blob is None:
+            return
+        blob[1] -= 1
+        if blob[1] > 0:
+            return
+        del self._blobs[content_hash]
+        self._total_bytes -= blob[0]
+        try:
+            os.remove(self._blob_path(content_hash))
+        except OSError:
+            pass
+
+    def has(self, job_id):
+        return job_id in self._index
+
+    def put(self, job_id, details, link=""):
+        """Store a page's details (a dict with at least ``description``) under ``job_id``.
+
+        Only the page content is hashed; ``link`` and the other metadata are
+        kept in the index entry.
+        """
+        if not job_id or not details.get("description"):
+            return None
+        content = {field: details[field] for field in _BLOB_FIELDS if field in details}
+        payload = json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        content_hash = hashlib.sha256(payload).hexdigest()
+
+        os.makedirs(self.directory, exist_ok=True)
+        blob_path = self._blob_path(content_hash)
+        if not os.path.exists(blob_path):
+            tmp_path = blob_path + ".tmp"
+            with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+                f.write(payload)
+            os.replace(tmp_path, blob_path)
+
+        now = time.time()
+        previous = self._index.get(job_id)
+        entry = {field: value for field, value in details.items() if field not in _BLOB_FIELDS}
+        entry.update({
+            "hash": content_hash,
+            "size": os.path.getsize(blob_path),
+            "link": link,
+            "stored_at": now,
+            "last_used": now,
+        })
+        self._index[job_id] = entry
+        self._add_ref(content_hash, entry["size"])
+        if previous is not None:
+            self._drop_ref(previous["hash"])
+        self._dirty = True
+        self._evict()
+        return content_hash
+
+    def get(self, job_id):
+        """Return the stored details for ``job_id``, or None."""
+        entry = self._index.get(job_id)
+        if entry is None:
+            return None
+        try:
+            with gzip.open(self._blob_path(entry["hash"]), "rb") as f:
+                content = json.loads(f.read().decode("utf-8"))
+        except (OSError, ValueError):
+            del self._index[job_id]
+            self._drop_ref(entry["hash"])
+            self._dirty = True
+            return None
+        entry["last_used"] = time.time()
+        self._dirty = True
+        metadata = {field: value for field, value in entry.items()
+                    if field not in ("hash", "size", "stored_at", "last_used")}
+        return {**content, **metadata}
+
+    def attach_descriptions(self, jobs):
+        """Set ``job["description"]`` on jobs whose detail page is stored."""
+        for job in jobs:
+            job_id = job.get("job_id")
+            if job_id in self._index and "description" not in job:
+                details = self.get(job_id)
+                if details:
+                    job["description"] = details["description"]
+        return jobs
+
+    def total_bytes(self):
+        return self._total_bytes
+
+    def _evict(self):
+        """Drop least-recently-used entries until blobs fit in ``max_bytes``."""
+        if self._total_bytes <= self.max_bytes:
+            return
+        for job_id in sorted(self._index, key=lambda key: self._index[key]["last_used"]):
+            self._drop_ref(self._index.pop(job_id)["hash"])
+            if self._total_bytes <= self.max_bytes:
+                break
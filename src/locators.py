@@ -0,0 +1,274 @@
+"""Named element locators that learn which selector variant matches.
+
+Each logical element ("search.card", "apply.button", ...) has a tuple of
+CSS selector variants, since Naukri serves several layouts. A single
+lookup first tries only the variant that matched last, which is usually
+one cheap selector; if that misses, one comma-joined query over all
+variants follows, so a miss costs two round-trips rather than one per
+variant. A union hit means the layout changed: the next lookup of that
+name probes to learn which variant matches now. Lookups of every matching
+element (``multiple``) always use the union query, so a page mixing
+layouts returns all of its cards.
+
+The first lookup of each name in a process, and every ``PROBE_EVERY``-th
+after that, probes all variants. A variant that never matched in
+``DEAD_AFTER_PROBES`` probes is reported as dead. Hit statistics persist in
+``data/locator_stats.json``; ``main.py selectors`` prints them.
+"""
+
+import json
+import os
+import time
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from src.tracker import DATA_DIR
+from src.utils import log_warn
+from src.waits import wait_for
+
+STATS_FILE = os.path.join(DATA_DIR, "locator_stats.json")
+
+PROBE_EVERY = 50
+DEAD_AFTER_PROBES = 3
+
+LOCATORS = {
+    # Search results
+    "search.card": (".srp-jobtuple-wrapper", "article.jobTuple", ".cust-job-tuple", "[class*='jobTuple']"),
+    "search.title": ("a.title", "a[class*='title']", ".job-title a", "h2 a"),
+    "search.company": ("a.comp-name", ".comp-name", "[class*='companyName']", ".subTitle a"),
+    "search.location": (".loc", ".locWdth", "[class*='location']", ".location"),
+    "search.experience": (".exp", ".expwdth", "[class*='experience']"),
+    "search.snippet": (".job-desc", ".job-description", "[class*='job-desc']"),
+    "search.tags": (".tags-gt li", "ul.tags li"),
+    "search.next_page": ("a.fright", "a[class*='next']", ".pagination a:last-child"),
+    # Job page
+    "apply.button": (
+        "button#apply-button", "button[class*='apply']", ".apply-btn",
+        "button[id*='apply']", ".apply-button-container button", "a[class*='apply-button']",
+    ),
+    "apply.chatbot": (".chatbot-container", "[class*='chatbot']", ".apply-dialog"),
+    "apply.chatbot_submit": ("button[type='submit']", "button.submit", "button[class*='submit']"),
+    # Login
+    "auth.logged_in": (
+        ".nI-gNb-drawer__hamburger", ".view-profile-wrapper", "a[href*='mnjuser/profile']",
+        "[class*='user-name']", ".nI-gNb-header__wrapper", "#root .dashboard-container",
+    ),
+    # Profile page
+    "profile.skills_section": (".keySkills", ".key-skill", "[class*='keySkill']"),
+    "profile.skills_input": ("input[class*='skillInput']", "input[placeholder*='skill' i]", ".chipEditor input"),
+    "profile.headline_section": (".resumeHeadline", "[class*='resumeHeadline']", "[class*='headline']"),
+    "profile.headline_input": ("textarea", "input[class*='headline' i]"),
+    "profile.headline_text": (".prefill", "[class*='prefill']"),
+    "profile.skill_item": (".chip", "span[class*='chip-']"),
+    "profile.skill_chip": (".chipEditor .chip", ".chipsContainer .chip"),
+    "profile.chip_remove": (".cross", "[class*='cross']", "[class*='close']"),
+    "profile.edit_icon": (".edit-icon", "span[class*='edit']", ".editIcon"),
+    "profile.save_button": ("button.save", "button[type='submit']", "button[class*='save' i]"),
+}
+
+_stats = None
+_dirty = False
+# Names probed at least once by this process
+_probed = set()
+
+
+def _load_stats():
+    global _stats
+    if _stats is None:
+        _stats = {}
+        if os.path.exists(STATS_FILE):
+            try:
+                with open(STATS_FILE, "r", encoding="utf-8") as f:
+                    _stats = json.load(f).get("locators", {})
+            except (OSError, ValueError):
+                _stats = {}
+    return _stats
+
+
+def _entry(name):
+    return _load_stats().setdefault(name, {"resolved": 0, "probes": 0, "last": None, "variants": {}})
+
+
+def variants(name):
+    """Return the variants of ``name``, last match first, then by hit count."""
+    declared = LOCATORS[name]
+    entry = _entry(name)
+    hits = {variant: entry["variants"].get(variant, {}).get("hits", 0) for variant in declared}
+    return sorted(
+        declared,
+        key=lambda variant: (variant != entry["last"], -hits[variant], declared.index(variant)),
+    )
+
+
+def css(name):
+    """All variants of ``name`` as one comma-joined selector, in learned order."""
+    return ", ".join(variants(name))
+
+
+def should_probe(name):
+    return name not in _probed or _entry(name)["resolved"] % PROBE_EVERY == 0
+
+
+def _record_resolved(name):
+    """Count a lookup resolved by the union query, which can't tell which variant matched."""
+    global _dirty
+    _entry(name)["resolved"] += 1
+    _dirty = True
+
+
+def record_hits(name, matched, probe=False):
+    """Record a resolved lookup.
+
+    ``matched`` maps each variant that matched to its hit count, in the order
+    the variants were tried; the first one is the variant that was used.
+    """
+    global _dirty
+    entry = _entry(name)
+    entry["resolved"] += 1
+    if probe:
+        entry["probes"] += 1
+        _probed.add(name)
+
+    now = time.time()
+    for variant, count in matched.items():
+        stats = entry["variants"].setdefault(variant, {"hits": 0, "probe_hits": 0, "last_hit": None})
+        stats["hits"] += count
+        stats["last_hit"] = now
+        if probe:
+            stats["probe_hits"] += 1
+
+    used = next(iter(matched))
+    if entry["last"] and used != entry["last"]:
+        log_warn(f"Locator {name}: '{entry['last']}' stopped matching, now using '{used}'")
+    entry["last"] = used
+    _dirty = True
+
+
+def _usable(elements, clickable):
+    for element in elements:
+        try:
+            if not clickable or (element.is_displayed() and element.is_enabled()):
+                return element
+        except StaleElementReferenceException:
+            # Re-rendered since it was found; a later poll finds the new one
+            continue
+    return None
+
+
+def _probe(scope, name, clickable, multiple):
+    """Query every variant, record per-variant hits and return the match (or None)."""
+    matched = {}
+    found = None
+    for variant in variants(name):
+        elements = scope.find_elements(By.CSS_SELECTOR, variant)
+        hit = elements if multiple else _usable(elements, clickable)
+        if not hit:
+            continue
+        matched[variant] = len(elements) if multiple else 1
+        if found is None:
+            found = hit
+    if found is None:
+        return None
+    record_hits(name, matched, probe=True)
+    if multiple and len(matched) > 1:
+        # Mixed layouts: return every matching element, in document order
+        found = scope.find_elements(By.CSS_SELECTOR, css(name))
+    return found
+
+
+def _locate(name, clickable=False, multiple=False):
+    """Build a ``wait_for`` condition resolving ``name`` to an element (or list)."""
+    probe = should_probe(name)
+
+    def condition(scope):
+        if probe:
+            return _probe(scope, name, clickable, multiple) or False
+
+        if not multiple:
+            preferred = variants(name)[0]
+            hit = _usable(scope.find_elements(By.CSS_SELECTOR, preferred), clickable)
+            if hit is not None:
+                record_hits(name, {preferred: 1})
+                return hit
+
+        elements = scope.find_elements(By.CSS_SELECTOR, css(name))
+        hit = elements if multiple else _usable(elements, clickable)
+        if not hit:
+            return False
+        _record_resolved(name)
+        if not multiple:
+            # The preferred variant stopped matching: probe next time to learn the new one
+            _probed.discard(name)
+        return hit
+
+    return condition
+
+
+def find(scope, name):
+    """Return the first element matching ``name`` under ``scope``, or None. Never waits."""
+    try:
+        return wait_for(scope, _locate(name), timeout=0, label=name)
+    except TimeoutException:
+        return None
+
+
+def find_all(scope, name):
+    """Return every element matching ``name`` under ``scope`` (possibly none). Never waits."""
+    try:
+        return wait_for(scope, _locate(name, multiple=True), timeout=0, label=name)
+    except TimeoutException:
+        return []
+
+
+def wait_for_locator(scope, name, timeout=10, clickable=False, multiple=False):
+    """Wait up to ``timeout`` seconds for ``name``; raises TimeoutException.
+
+    With ``multiple=True`` returns every element matching any variant.
+    """
+    return wait_for(scope, _locate(name, clickable, multiple), timeout=timeout, label=name)
+
+
+def wait_optional_locator(scope, name, timeout, clickable=False):
+    """Like ``wait_for_locator`` but returns None instead of raising on timeout."""
+    try:
+        return wait_for_locator(scope, name, timeout=timeout, clickable=clickable)
+    except TimeoutException:
+        return None
+
+
+def dead_variants():
+    """Return ``[(name, variant)]`` for variants that missed every one of enough probes."""
+    dead = []
+    for name, declared in LOCATORS.items():
+        entry = _load_stats().get(name)
+        if not entry or entry["probes"] < DEAD_AFTER_PROBES:
+            continue
+        for variant in declared:
+            if entry["variants"].get(variant, {}).get("probe_hits", 0) == 0:
+                dead.append((name, variant))
+    return dead
+
+
+def get_stats():
+    return _load_stats()
+
+
+def save_stats():
+    global _dirty
+    if not _dirty:
+        return
+    os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
+    tmp_path = STATS_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"locators": _stats}, f, indent=2)
+    os.replace(tmp_path, STATS_FILE)
+    _dirty = False
+
+
+def log_locator_report():
+    """Persist hit statistics and warn about dead variants."""
+    save_stats()
+    dead = dead_variants()
+    if dead:
+        log_warn(f"Dead selector variants ({len(dead)}): " + ", ".join(f"{name} '{variant}'" for name, variant in dead))
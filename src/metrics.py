@@ -0,0 +1,173 @@
+"""Run metrics exported in Prometheus text format for node_exporter's textfile collector.
+
+Metrics are module-level objects updated from the hot paths. ``write_textfile``
+writes all of them atomically (temp file + rename) so the collector never
+reads a half-written file; ``start_periodic_writer`` does the same on an
+interval during long runs. Each main.py command writes its own file and
+passes ``command``, which is added as a label to every series, so the
+collector, which merges all ``*.prom`` files, never sees the same series
+twice.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60)
+
+_registry = []
+_lock = threading.Lock()
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    labels = sorted(labels)
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _merge(labels, extra_labels):
+    """``labels`` plus ``extra_labels``; a label the series already has is kept."""
+    return tuple({**dict(extra_labels), **dict(labels)}.items())
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        _registry.append(self)
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name, documentation):
+        super().__init__(name, documentation)
+        self._values = defaultdict(float)
+
+    def inc(self, amount=1, **labels):
+        with _lock:
+            self._values[tuple(sorted(labels.items()))] += amount
+
+    def render(self, extra_labels=()):
+        lines = self._header()
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(_merge(labels, extra_labels))} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def set(self, value, **labels):
+        with _lock:
+            self._values[tuple(sorted(labels.items()))] = value
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [bucket counts..., sum, count]
+        self._values = {}
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with _lock:
+            entry = self._values.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def render(self, extra_labels=()):
+        lines = self._header()
+        for labels, entry in sorted(self._values.items()):
+            labels = _merge(labels, extra_labels)
+            for bound, count in zip(self.buckets, entry):
+                bucket_labels = labels + (("le", f"{bound:g}"),)
+                lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {entry[-1]}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(entry[-2])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {entry[-1]}")
+        return lines
+
+
+JOBS_FOUND = Counter("naukri_jobs_found_total", "Job cards parsed from search results, by keyword.")
+APPLY_RESULTS = Counter("naukri_apply_results_total", "Jobs processed by apply_to_jobs, by result.")
+PAGE_LOAD_SECONDS = Histogram("naukri_page_load_seconds", "Time spent in driver.get/refresh, by page type.")
+ELEMENT_WAIT_TIMEOUTS = Counter("naukri_element_wait_timeouts_total", "Explicit element waits that timed out, by locator name.")
+ELEMENT_WAIT_SECONDS = Counter("naukri_element_wait_seconds_total", "Seconds spent waiting on elements that never appeared.")
+LOGINS = Counter("naukri_login_total", "Login attempts by path taken.")
+TRACKER_SIZE = Gauge("naukri_tracker_applications", "Applications recorded in the tracker.")
+COMMAND_DURATION = Gauge("naukri_command_duration_seconds", "Duration of the last run of each main.py command.")
+LAST_RUN = Gauge("naukri_command_last_run_timestamp_seconds", "Unix time the last run of each command finished.")
+
+
+def render(**extra_labels):
+    """Return all metrics in Prometheus text exposition format, with ``extra_labels`` on every series."""
+    extra = tuple(extra_labels.items())
+    with _lock:
+        lines = []
+        for metric in _registry:
+            lines.extend(metric.render(extra))
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path, command=None):
+    """Atomically write all metrics to ``path`` (a ``.prom`` file), labelled with ``command`` if given."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".naukri-", suffix=".prom.tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render(**({"command": command} if command else {})))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def start_periodic_writer(path, interval_seconds, command=None):
+    """Rewrite the textfile every ``interval_seconds`` from a daemon thread.
+
+    Returns a ``threading.Event``; set it to stop the writer.
+    """
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval_seconds):
+            try:
+                write_textfile(path, command)
+            except OSError:
+                pass
+
+    threading.Thread(target=loop, name="metrics-writer", daemon=True).start()
+    return stop
+
+
+def record_command(command, started):
+    """Record duration and completion time for a main.py command."""
+    COMMAND_DURATION.set(time.time() - started, command=command)
+    LAST_RUN.set(time.time(), command=command)
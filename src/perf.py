@@ -0,0 +1,123 @@
+"""Lightweight timing spans for the hot paths.
+
+Wrap work in ``span(name, kind)`` (or decorate with ``timed``). Spans are
+aggregated per run into count/total/p50/p95 per name, and into time per
+kind: ``browser`` (waiting on Chrome), ``delay`` (deliberate human-like
+sleeps) and ``local`` (our own work such as tracker writes). Nested spans
+count towards their own kind only, so a delay inside a browser span is not
+counted twice.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from src.metrics import PAGE_LOAD_SECONDS
+
+LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
+REPORT_FILE = os.path.join(LOG_DIR, "perf_report.json")
+
+KINDS = ("browser", "delay", "local")
+
+_lock = threading.Lock()
+_local = threading.local()
+_durations = defaultdict(list)
+_kind_of = {}
+_kind_totals = defaultdict(float)
+_run = {"wall": time.perf_counter(), "cpu": time.process_time()}
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def span(name, kind="browser"):
+    """Time the enclosed block under ``name``."""
+    stack = _stack()
+    frame = {"children": 0.0}
+    stack.append(frame)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        stack.pop()
+        if stack:
+            stack[-1]["children"] += elapsed
+        if name.startswith("driver."):
+            PAGE_LOAD_SECONDS.observe(elapsed, page=name.partition(":")[2] or name)
+        with _lock:
+            _durations[name].append(elapsed)
+            _kind_of[name] = kind
+            _kind_totals[kind] += max(0.0, elapsed - frame["children"])
+
+
+def timed(name, kind="browser"):
+    """Decorator form of ``span``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def reset():
+    """Start a new run: drop all recorded spans."""
+    with _lock:
+        _durations.clear()
+        _kind_of.clear()
+        _kind_totals.clear()
+        _run["wall"] = time.perf_counter()
+        _run["cpu"] = time.process_time()
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summary():
+    """Return the aggregated spans and time split for the current run."""
+    with _lock:
+        spans = {
+            name: {
+                "kind": _kind_of[name],
+                "count": len(values),
+                "total_s": sum(values),
+                "p50_s": _percentile(values, 50),
+                "p95_s": _percentile(values, 95),
+            }
+            for name, values in _durations.items()
+        }
+        by_kind = {kind: _kind_totals.get(kind, 0.0) for kind in KINDS}
+
+    wall = time.perf_counter() - _run["wall"]
+    return {
+        "wall_s": wall,
+        "process_cpu_s": time.process_time() - _run["cpu"],
+        "by_kind_s": by_kind,
+        "untracked_s": max(0.0, wall - sum(by_kind.values())),
+        "spans": dict(sorted(spans.items(), key=lambda kv: kv[1]["total_s"], reverse=True)),
+    }
+
+
+def write_report(path=REPORT_FILE, extra=None):
+    """Write ``summary()`` (plus ``extra`` fields) as JSON. Returns the path."""
+    report = summary()
+    report["finished_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    if extra:
+        report.update(extra)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
@@ -1,43 +1,156 @@
-from selenium.webdriver.common.by import By
+import json
+import os
+import time
+
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
+from src.locators import find, find_all, variants, wait_for_locator
+from src.perf import span
+from src.tracker import DATA_DIR
 from src.utils import human_type, log_error, log_info, log_warn, random_delay, random_scroll
 
 PROFILE_URL = "https://www.naukri.com/mnjuser/profile"
+PROFILE_STATE_FILE = os.path.join(DATA_DIR, "profile_state.json")
+
+# Naukri caps key skills well below this; a longer list, or an entry longer
+# than a skill name can be, means the page was misread
+MAX_SKILLS = 50
+MAX_SKILL_LENGTH = 60
+
+# Reads the current key skills and headline in one round-trip; a field that
+# can't be found comes back as null
+_READ_STATE_JS = """
+const [skillsSectionSels, skillItemSels, headlineSectionSels, headlineTextSels] = arguments;
+const first = (scope, sels) => {
+    for (const sel of sels) {
+        const el = scope.querySelector(sel);
+        if (el) return el;
+    }
+    return null;
+};
+let skills = null;
+const skillsSection = first(document, skillsSectionSels);
+if (skillsSection) {
+    for (const sel of skillItemSels) {
+        const items = skillsSection.querySelectorAll(sel);
+        if (items.length) {
+            skills = Array.from(items).map(el => el.innerText.trim()).filter(Boolean);
+            break;
+        }
+    }
+}
+const headlineSection = first(document, headlineSectionSels);
+const headlineEl = headlineSection ? first(headlineSection, headlineTextSels) : null;
+return {skills: skills, headline: headlineEl ? headlineEl.innerText.trim() : null};
+"""
+
+
+def _load_profile_snapshot():
+    if not os.path.exists(PROFILE_STATE_FILE):
+        return {}
+    try:
+        with open(PROFILE_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
 
-def update_skills(driver, skills_list):
-    """Navigate to profile and update key skills."""
-    if not skills_list:
-        log_warn("No skills provided to update")
-        return False
+def _save_profile_snapshot(state):
+    os.makedirs(os.path.dirname(PROFILE_STATE_FILE), exist_ok=True)
+    tmp_path = PROFILE_STATE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"skills": state["skills"], "headline": state["headline"], "saved_at": time.time()}, f, indent=2)
+    os.replace(tmp_path, PROFILE_STATE_FILE)
 
-    log_info("Updating profile skills...")
-    driver.get(PROFILE_URL)
+
+def _load_profile_page(driver):
+    with span("driver.get:profile"):
+        driver.get(PROFILE_URL)
     random_delay(3, 5)
-    random_scroll(driver)
 
+
+def _read_state(driver):
+    """Read skills and headline from the open profile page (see ``read_profile_state``)."""
+    state = {"skills": None, "headline": None}
     try:
-        wait = WebDriverWait(driver, 15)
+        wait_for_locator(driver, "profile.headline_section", timeout=15)
+        state.update(driver.execute_script(
+            _READ_STATE_JS,
+            variants("profile.skills_section"), variants("profile.skill_item"),
+            variants("profile.headline_section"), variants("profile.headline_text"),
+        ) or {})
+    except Exception as e:
+        log_warn(f"Could not read profile state: {e}")
+
+    snapshot = _load_profile_snapshot()
+    for key in ("skills", "headline"):
+        if state[key] is None and snapshot.get(key) is not None:
+            log_warn(f"Using last saved profile {key} — could not read it from the page")
+            state[key] = snapshot[key]
+    return state
+
+
+def read_profile_state(driver):
+    """Open the profile page and return its current ``{"skills": [...], "headline": ...}``.
+
+    Fields that can't be read from the page fall back to the last saved
+    snapshot, and are None if there is none.
+    """
+    _load_profile_page(driver)
+    return _read_state(driver)
+
+
+def skills_plausible(skills):
+    """True if ``skills`` looks like a real key skills list, safe to remove skills against."""
+    return (
+        bool(skills)
+        and len(skills) <= MAX_SKILLS
+        and all(len(skill) <= MAX_SKILL_LENGTH and "\n" not in skill for skill in skills)
+    )
+
+
+def diff_skills(current, wanted):
+    """Return ``(to_add, to_remove)``, comparing skills case-insensitively."""
+    current_keys = {skill.strip().lower(): skill for skill in current}
+    wanted_keys = {skill.strip().lower(): skill for skill in wanted}
+    to_add = [skill for key, skill in wanted_keys.items() if key not in current_keys]
+    to_remove = [skill for key, skill in current_keys.items() if key not in wanted_keys]
+    return to_add, to_remove
+
 
+def _find_skill_chip(driver, skill):
+    """Return the chip for ``skill`` in the open skills editor, or None."""
+    wanted = skill.strip().lower()
+    for chip in find_all(driver, "profile.skill_chip"):
+        if chip.text.strip().lower() == wanted:
+            return chip
+    return None
+
+
+def _edit_skills(driver, skills_list, remove=()):
+    """Add and remove key skills on the open profile page. Returns True on success."""
+    try:
         # Find and click the key skills edit button
-        skills_section = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".keySkills, .key-skill, [class*='keySkill']"))
-        )
+        skills_section = wait_for_locator(driver, "profile.skills_section", timeout=15)
         random_scroll(driver)
         random_delay(1, 2)
 
         # Click edit icon near key skills
-        edit_btn = skills_section.find_element(By.CSS_SELECTOR, ".edit-icon, span[class*='edit'], .editIcon")
+        edit_btn = wait_for_locator(skills_section, "profile.edit_icon", timeout=5)
         edit_btn.click()
         random_delay(2, 3)
 
         # Clear existing skills input and add new ones
-        skills_input = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[class*='skillInput'], input[placeholder*='skill' i], .chipEditor input"))
-        )
+        skills_input = wait_for_locator(driver, "profile.skills_input", timeout=15)
+
+        for skill in remove:
+            chip = _find_skill_chip(driver, skill)
+            remove_btn = find(chip, "profile.chip_remove") if chip else None
+            if remove_btn is None:
+                log_warn(f"  Could not find skill to remove: {skill}")
+                continue
+            remove_btn.click()
+            random_delay(0.5, 1)
 
         for skill in skills_list:
             skills_input.clear()
@@ -47,13 +160,14 @@ def update_skills(driver, skills_list):
             random_delay(0.5, 1)
 
         # Save
-        save_btn = wait.until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.save, button[type='submit'], button[class*='save' i]"))
-        )
+        save_btn = wait_for_locator(driver, "profile.save_button", timeout=15, clickable=True)
         save_btn.click()
         random_delay(2, 3)
 
-        log_info(f"Skills updated: {', '.join(skills_list)}")
+        if skills_list:
+            log_info(f"Skills added: {', '.join(skills_list)}")
+        if remove:
+            log_info(f"Skills removed: {', '.join(remove)}")
         return True
 
     except Exception as e:
@@ -61,48 +175,39 @@ def update_skills(driver, skills_list):
         return False
 
 
-def update_resume_headline(driver, headline):
-    """Update the resume headline on the profile."""
-    if not headline:
-        log_warn("No headline provided")
-        return False
+def _toggle_trailing_space(text):
+    return text.rstrip() if text.endswith(" ") else text + " "
 
-    log_info("Updating resume headline...")
-    driver.get(PROFILE_URL)
-    random_delay(3, 5)
 
-    try:
-        wait = WebDriverWait(driver, 15)
+def _edit_headline(driver, headline):
+    """Retype the resume headline on the open profile page. Returns True on success.
 
+    ``headline`` is the new text, or a function mapping the current text to it.
+    """
+    try:
         # Find resume headline section
-        headline_section = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".resumeHeadline, [class*='resumeHeadline'], [class*='headline']"))
-        )
+        headline_section = wait_for_locator(driver, "profile.headline_section", timeout=15)
         random_scroll(driver)
         random_delay(1, 2)
 
         # Click edit
-        edit_btn = headline_section.find_element(By.CSS_SELECTOR, ".edit-icon, span[class*='edit'], .editIcon")
+        edit_btn = wait_for_locator(headline_section, "profile.edit_icon", timeout=5)
         edit_btn.click()
         random_delay(2, 3)
 
         # Clear and type new headline
-        textarea = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "textarea, input[class*='headline' i]"))
-        )
+        textarea = wait_for_locator(driver, "profile.headline_input", timeout=15)
+        if callable(headline):
+            headline = headline(textarea.get_attribute("value") or "")
         textarea.clear()
         random_delay(0.5, 1)
         human_type(textarea, headline)
         random_delay(1, 2)
 
         # Save
-        save_btn = wait.until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.save, button[type='submit'], button[class*='save' i]"))
-        )
+        save_btn = wait_for_locator(driver, "profile.save_button", timeout=15, clickable=True)
         save_btn.click()
         random_delay(2, 3)
-
-        log_info(f"Headline updated: {headline}")
         return True
 
     except Exception as e:
@@ -110,54 +215,137 @@ def update_resume_headline(driver, headline):
         return False
 
 
-def refresh_profile(driver):
-    """Make a minor edit to trigger Naukri's 'profile updated' boost.
+class ProfileSession:
+    """Batched profile edits made in a single visit to the profile page.
 
-    Toggles a trailing space on the resume headline to signal an update
-    without changing visible content.
-    """
-    log_info("Refreshing profile to boost visibility...")
-    driver.get(PROFILE_URL)
-    random_delay(3, 5)
+    Queue edits with ``set_skills``, ``set_headline`` and ``refresh``, then
+    ``apply`` opens the page once, reads the current state and makes only the
+    edits that change something. A headline change already counts as a
+    profile update, so a queued refresh is dropped when the headline changes.
 
-    try:
-        wait = WebDriverWait(driver, 15)
+    ``page_loads`` counts the documents actually loaded, including any
+    navigation a save triggers. It is measured after each step by watching
+    ``performance.timeOrigin``, which changes with every new document.
+    """
 
-        headline_section = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".resumeHeadline, [class*='resumeHeadline'], [class*='headline']"))
-        )
-        random_scroll(driver)
-        random_delay(1, 2)
+    def __init__(self, driver):
+        self.driver = driver
+        self.page_loads = 0
+        self._document = None
+        self._skills = []
+        self._headline = ""
+        self._refresh = False
+
+    def set_skills(self, skills):
+        self._skills = list(skills)
+        return self
+
+    def set_headline(self, headline):
+        self._headline = headline
+        return self
+
+    def refresh(self):
+        self._refresh = True
+        return self
+
+    def _count_page_load(self):
+        try:
+            document = self.driver.execute_script("return performance.timeOrigin")
+        except Exception:
+            return
+        if document != self._document:
+            self._document = document
+            self.page_loads += 1
+
+    def apply(self):
+        """Run the queued edits.
+
+        Returns ``{"skills_added", "skills_removed", "headline_changed",
+        "refreshed", "page_loads", "seconds"}``.
+        """
+        started = time.perf_counter()
+        result = {"skills_added": [], "skills_removed": [], "headline_changed": False, "refreshed": False}
+
+        _load_profile_page(self.driver)
+        self._count_page_load()
+
+        state = {"skills": None, "headline": None}
+        if self._skills or self._headline:
+            log_info("Reading current profile...")
+            state = _read_state(self.driver)
+
+        if self._skills:
+            if state["skills"] is None:
+                to_add, to_remove = list(self._skills), []
+            else:
+                to_add, to_remove = diff_skills(state["skills"], self._skills)
+                if to_remove and not skills_plausible(state["skills"]):
+                    # Removing is destructive: never do it against a list that may be misread
+                    log_warn(f"Read {len(state['skills'])} key skills, which looks wrong — not removing any")
+                    to_remove = []
+            if not to_add and not to_remove:
+                log_info("Key skills already up to date")
+            elif _edit_skills(self.driver, to_add, remove=to_remove):
+                result["skills_added"], result["skills_removed"] = to_add, to_remove
+                state["skills"] = list(self._skills)
+            self._count_page_load()
+
+        if self._headline:
+            if (state["headline"] or "").strip() == self._headline.strip():
+                log_info("Resume headline already up to date")
+            elif _edit_headline(self.driver, self._headline):
+                log_info(f"Headline updated: {self._headline}")
+                result["headline_changed"] = result["refreshed"] = True
+                state["headline"] = self._headline
+            self._count_page_load()
+
+        if self._refresh and not result["refreshed"]:
+            # Toggles a trailing space: counts as an update without changing visible content
+            log_info("Refreshing profile to boost visibility...")
+            result["refreshed"] = _edit_headline(self.driver, _toggle_trailing_space)
+            if result["refreshed"]:
+                log_info("Profile refreshed successfully")
+            self._count_page_load()
+
+        if state["skills"] is not None and not skills_plausible(state["skills"]):
+            state["skills"] = None
+        if state["skills"] is not None or state["headline"] is not None:
+            _save_profile_snapshot(state)
+
+        result["page_loads"] = self.page_loads
+        result["seconds"] = round(time.perf_counter() - started, 1)
+        return result
+
+
+def update_skills(driver, skills_list, remove=()):
+    """Navigate to profile, add ``skills_list`` to key skills and remove ``remove``."""
+    if not skills_list and not remove:
+        log_warn("No skills provided to update")
+        return False
 
-        edit_btn = headline_section.find_element(By.CSS_SELECTOR, ".edit-icon, span[class*='edit'], .editIcon")
-        edit_btn.click()
-        random_delay(2, 3)
+    log_info("Updating profile skills...")
+    _load_profile_page(driver)
+    return _edit_skills(driver, skills_list, remove)
 
-        textarea = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "textarea, input[class*='headline' i]"))
-        )
 
-        current_text = textarea.get_attribute("value") or ""
-        # Toggle trailing space
-        if current_text.endswith(" "):
-            new_text = current_text.rstrip()
-        else:
-            new_text = current_text + " "
+def update_resume_headline(driver, headline):
+    """Update the resume headline on the profile."""
+    if not headline:
+        log_warn("No headline provided")
+        return False
 
-        textarea.clear()
-        random_delay(0.5, 1)
-        human_type(textarea, new_text)
-        random_delay(1, 2)
+    log_info("Updating resume headline...")
+    _load_profile_page(driver)
+    if _edit_headline(driver, headline):
+        log_info(f"Headline updated: {headline}")
+        return True
+    return False
 
-        save_btn = wait.until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "button.save, button[type='submit'], button[class*='save' i]"))
-        )
-        save_btn.click()
-        random_delay(2, 3)
 
-        log_info("Profile refreshed successfully")
-        return True
+def refresh_profile(driver):
+    """Make a minor edit to trigger Naukri's 'profile updated' boost.
 
-    except Exception as e:
-        log_error(f"Failed to refresh profile: {e}")
-        return False
+    Toggles a trailing space on the resume headline to signal an update
+    without changing visible content.
+    """
+    return ProfileSession(driver).refresh().apply()["refreshed"]
@@ -0,0 +1,129 @@
+"""Persistent queue of failed applications to retry on later runs.
+
+A job that fails for a transient reason (apply button missing, page
+timeout, chatbot left unanswered, driver error) is saved with its card
+fields, the reason code and an attempt count. Each failure pushes its next
+attempt out exponentially (``base_minutes * 2 ** (attempts - 1)``, capped);
+after ``max_attempts`` failures the job is dropped. ``run_apply_cycle``
+applies to due entries before it searches.
+"""
+
+import json
+import os
+import time
+
+from src.filters import JOB_FIELDS, job_key
+from src.tracker import DATA_DIR
+from src.utils import log_info, log_warn
+
+QUEUE_FILE = os.path.join(DATA_DIR, "retry_queue.json")
+
+# Reason codes returned by _apply_single_job / handle_apply_flow
+BUTTON_NOT_FOUND = "button_not_found"
+TIMEOUT = "timeout"
+CHATBOT_UNANSWERED = "chatbot_unanswered"
+DRIVER_ERROR = "error"
+ALREADY_APPLIED = "already_applied"
+NO_LINK = "no_link"
+
+RETRYABLE_REASONS = (BUTTON_NOT_FOUND, TIMEOUT, CHATBOT_UNANSWERED, DRIVER_ERROR)
+
+
+class RetryQueue:
+    def __init__(self, path=QUEUE_FILE, max_attempts=4, base_minutes=30, max_backoff_hours=24):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.base_seconds = base_minutes * 60
+        self.max_backoff_seconds = max_backoff_hours * 3600
+        self._entries = self._load()
+        self._dirty = False
+
+    @classmethod
+    def from_config(cls, config):
+        retry_cfg = config.get("retry", {})
+        if not retry_cfg.get("enabled", True):
+            return None
+        return cls(
+            max_attempts=retry_cfg.get("max_attempts", 4),
+            base_minutes=retry_cfg.get("base_minutes", 30),
+            max_backoff_hours=retry_cfg.get("max_backoff_hours", 24),
+        )
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            return {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, job):
+        return job_key(job) in self._entries
+
+    def backoff(self, attempts):
+        return min(self.base_seconds * 2 ** (attempts - 1), self.max_backoff_seconds)
+
+    def record_failure(self, job, reason):
+        """Queue ``job`` for a later retry. Returns False if it won't be retried."""
+        key = job_key(job)
+        if not key or reason not in RETRYABLE_REASONS:
+            self.discard(job)
+            return False
+
+        now = time.time()
+        entry = self._entries.get(key) or {
+            "job": {field: job[field] for field in JOB_FIELDS if field in job},
+            "attempts": 0,
+            "first_failed": now,
+        }
+        entry["attempts"] += 1
+        entry["reason"] = reason
+        entry["last_failed"] = now
+        self._dirty = True
+
+        if entry["attempts"] >= self.max_attempts:
+            self._entries.pop(key, None)
+            log_warn(f"  Giving up after {entry['attempts']} attempts ({reason})")
+            return False
+
+        entry["next_attempt"] = now + self.backoff(entry["attempts"])
+        self._entries[key] = entry
+        return True
+
+    def discard(self, job):
+        """Remove ``job`` from the queue (applied, skipped, or not retryable)."""
+        if self._entries.pop(job_key(job), None) is not None:
+            self._dirty = True
+
+    def due(self, now=None):
+        """Return copies of queued jobs whose backoff has elapsed, oldest failure first."""
+        now = time.time() if now is None else now
+        ready = [entry for entry in self._entries.values() if entry["next_attempt"] <= now]
+        ready.sort(key=lambda entry: entry["first_failed"])
+        return [dict(entry["job"]) for entry in ready]
+
+    def waiting_keys(self, now=None):
+        """Return the keys of queued jobs still waiting out their backoff."""
+        now = time.time() if now is None else now
+        return {key for key, entry in self._entries.items() if entry["next_attempt"] > now}
+
+    def keys(self):
+        return set(self._entries)
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": self._entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def log_stats(self, due_count):
+        if self._entries:
+            log_info(f"Retry queue: {due_count} due, {len(self._entries) - due_count} waiting on backoff")
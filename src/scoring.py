@@ -0,0 +1,143 @@
+"""Job relevance scoring, so the daily apply cap goes to the best matches first.
+
+Each job is scored against the ``profile`` and ``search`` sections of
+config.json:
+
+- text: TF-IDF cosine similarity between the job's title + card snippet (+
+  the full description, when the job store has one) and the profile's
+  skills + headline (computed over sparse arrays, no loops
+  over the vocabulary)
+- experience: whether the job's experience range overlaps the configured one
+- location: whether the job is in one of the configured locations
+
+The weighted sum is stored on the job dict as ``score``.
+"""
+
+import math
+import re
+
+import numpy as np
+
+from src.filters import parse_experience
+
+DEFAULT_WEIGHTS = {"text": 0.7, "experience": 0.15, "location": 0.15}
+
+# Keeps tech tokens like "node.js", "c++" and "c#" intact
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_STOPWORDS = {"and", "or", "the", "a", "an", "in", "of", "for", "to", "with", "on", "at", "is", "we", "are", "you"}
+
+
+def tokenize(text):
+    tokens = (token.rstrip(".") for token in _TOKEN_RE.findall((text or "").lower()))
+    return [token for token in tokens if token and token not in _STOPWORDS]
+
+
+def _job_text(job):
+    # Title counts double: it is the strongest signal on a card
+    title = job.get("title", "")
+    return f"{title} {title} {job.get('snippet', '')} {job.get('description', '')}"
+
+
+def _profile_text(config):
+    profile = config.get("profile", {})
+    return " ".join(profile.get("skills", [])) + " " + profile.get("headline", "")
+
+
+def text_similarity(job_texts, profile_text):
+    """Cosine similarity of each job text to the profile text under TF-IDF weighting.
+
+    Returns a float array aligned with ``job_texts``.
+    """
+    n_jobs = len(job_texts)
+    if n_jobs == 0:
+        return np.zeros(0)
+
+    vocab = {}
+    rows, cols = [], []
+    for row, text in enumerate(list(job_texts) + [profile_text]):
+        for token in tokenize(text):
+            rows.append(row)
+            cols.append(vocab.setdefault(token, len(vocab)))
+    if not vocab:
+        return np.zeros(n_jobs)
+
+    n_docs = n_jobs + 1
+    n_terms = len(vocab)
+    # Sparse term counts as (row, col, count) triples
+    keys, counts = np.unique(np.asarray(rows, dtype=np.int64) * n_terms + np.asarray(cols, dtype=np.int64),
+                             return_counts=True)
+    rows, cols = np.divmod(keys, n_terms)
+
+    doc_freq = np.bincount(cols, minlength=n_terms)
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1.0
+    weights = (1 + np.log(counts)) * idf[cols]
+
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=n_docs))
+
+    profile_vec = np.zeros(n_terms)
+    is_profile = rows == n_jobs
+    profile_vec[cols[is_profile]] = weights[is_profile]
+    if norms[n_jobs] == 0:
+        return np.zeros(n_jobs)
+
+    dots = np.bincount(rows, weights=weights * profile_vec[cols], minlength=n_docs)[:n_jobs]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sims = dots / (norms[:n_jobs] * norms[n_jobs])
+    return np.nan_to_num(sims)
+
+
+def _experience_fit(job, exp_min, exp_max):
+    job_range = parse_experience(job.get("experience", ""))
+    if job_range is None:
+        return 0.5
+    job_min, job_max = job_range
+    lo = exp_min if exp_min is not None else -math.inf
+    hi = exp_max if exp_max is not None else math.inf
+    return 1.0 if job_min <= hi and job_max >= lo else 0.0
+
+
+def _location_fit(job, locations):
+    location = (job.get("location") or "").lower()
+    if not location or location == "unknown" or not locations:
+        return 0.5
+    return 1.0 if any(loc in location for loc in locations) else 0.0
+
+
+def score_jobs(jobs, config):
+    """Set ``job["score"]`` on every job and return the scores as an array."""
+    jobs = list(jobs)
+    if not jobs:
+        return np.zeros(0)
+
+    weights = {**DEFAULT_WEIGHTS, **config.get("ranking", {}).get("weights", {})}
+    search_cfg = config.get("search", {})
+    experience = search_cfg.get("experience", {})
+    locations = [loc.lower() for loc in search_cfg.get("location", [])]
+
+    text = text_similarity([_job_text(job) for job in jobs], _profile_text(config))
+    exp_fit = np.array([_experience_fit(job, experience.get("min"), experience.get("max")) for job in jobs])
+    loc_fit = np.array([_location_fit(job, locations) for job in jobs])
+
+    scores = weights["text"] * text + weights["experience"] * exp_fit + weights["location"] * loc_fit
+    for job, score in zip(jobs, scores):
+        job["score"] = round(float(score), 4)
+    return scores
+
+
+def rank_jobs(jobs, config):
+    """Score ``jobs`` and return them best-first (ties keep crawl order)."""
+    jobs = list(jobs)
+    scores = score_jobs(jobs, config)
+    order = np.argsort(-scores, kind="stable")
+    return [jobs[i] for i in order]
+
+
+def iter_ranked(pages, config):
+    """Rank each page of a streamed search (see ``iter_job_pages``) before yielding it."""
+    try:
+        for page_jobs in pages:
+            yield rank_jobs(page_jobs, config)
+    finally:
+        close = getattr(pages, "close", None)
+        if close:
+            close()
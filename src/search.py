@@ -1,13 +1,72 @@
+import time
 import urllib.parse
 
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-
+from src import locators
+from src.filters import is_known, job_key
+from src.metrics import JOBS_FOUND
+from src.perf import span
+from src.search_cache import SearchCache
 from src.utils import log_error, log_info, log_warn, random_delay, random_scroll
 
 SEARCH_BASE_URL = "https://www.naukri.com"
 
+# Locator names read by _EXTRACT_CARDS_JS, keyed by the field name it uses
+_CARD_FIELDS = {
+    "card": "search.card",
+    "title": "search.title",
+    "company": "search.company",
+    "location": "search.location",
+    "experience": "search.experience",
+    "snippet": "search.snippet",
+    "tags": "search.tags",
+}
+
+# Pulls every card's fields in one round-trip instead of 5+ per card. Each
+# single-element field's selector variants are tried in order (all of them
+# when probing) and per-variant hit counts are returned for the locator
+# registry. List fields (cards, tags) match every variant at once, like
+# ``locators.find_all``, so a page mixing layouts yields all of its cards.
+_EXTRACT_CARDS_JS = """
+const [variants, probe] = arguments;
+const counts = {};
+for (const field in variants) counts[field] = variants[field].map(() => 0);
+const union = (scope, list) => {
+    const hit = Array.from(scope.querySelectorAll(list.join(", ")));
+    return hit.length ? hit : null;
+};
+const pick = (scope, field, all) => {
+    const list = variants[field];
+    if (all && !probe) return union(scope, list);
+    let found = null;
+    for (let i = 0; i < list.length; i++) {
+        const hit = all ? Array.from(scope.querySelectorAll(list[i])) : scope.querySelector(list[i]);
+        if (all ? hit.length === 0 : hit === null) continue;
+        counts[field][i] += 1;
+        if (found === null) found = hit;
+        if (!probe) break;
+    }
+    return all && found !== null ? union(scope, list) : found;
+};
+const textOf = (card, field) => {
+    const el = pick(card, field, false);
+    return el ? el.innerText.trim() : null;
+};
+const jobs = (pick(document, "card", true) || []).map(card => {
+    const titleEl = pick(card, "title", false);
+    return {
+        title: titleEl ? titleEl.innerText.trim() : "",
+        link: titleEl ? (titleEl.href || "") : "",
+        company: textOf(card, "company"),
+        location: textOf(card, "location"),
+        experience: textOf(card, "experience"),
+        snippet: [textOf(card, "snippet") || ""]
+            .concat((pick(card, "tags", true) || []).map(el => el.innerText.trim()))
+            .join(" ").trim(),
+    };
+});
+return {jobs: jobs, counts: counts};
+"""
+
 
 def _build_search_url(keyword, config):
     """Build a Naukri search URL from keyword and config filters."""
@@ -41,58 +100,111 @@ def _build_search_url(keyword, config):
     return url
 
 
-def parse_job_listings(driver):
-    """Extract job cards from the current search results page."""
+def _extract_job_id(link):
+    """Extract the numeric job ID from the end of a job URL."""
+    if not link:
+        return ""
+    parts = link.rstrip("/").split("-")
+    for part in reversed(parts):
+        cleaned = part.split("?")[0]
+        if cleaned.isdigit():
+            return cleaned
+    return ""
+
+
+def _make_job(title, link, company=None, location=None, experience=None, snippet=""):
+    """Build a job dict; ``None`` marks a field whose element was missing."""
+    return {
+        "title": title,
+        "company": "Unknown" if company is None else company,
+        "location": "Unknown" if location is None else location,
+        "experience": "" if experience is None else experience,
+        "link": link,
+        "job_id": _extract_job_id(link),
+        "snippet": snippet or "",
+    }
+
+
+def _parse_cards_script(driver):
+    """Extract all cards with a single execute_script call."""
+    probe = any(locators.should_probe(name) for name in _CARD_FIELDS.values())
+    ordered = {field: locators.variants(name) for field, name in _CARD_FIELDS.items()}
+    result = driver.execute_script(_EXTRACT_CARDS_JS, ordered, probe) or {}
+
+    for field, counts in (result.get("counts") or {}).items():
+        matched = {variant: count for variant, count in zip(ordered[field], counts) if count}
+        if matched:
+            locators.record_hits(_CARD_FIELDS[field], matched, probe=probe)
+
     jobs = []
+    for raw in result.get("jobs") or []:
+        title = (raw.get("title") or "").strip()
+        link = raw.get("link") or ""
+        if title and link:
+            jobs.append(_make_job(
+                title, link, raw.get("company"), raw.get("location"), raw.get("experience"), raw.get("snippet"),
+            ))
+    return jobs
 
-    try:
-        wait = WebDriverWait(driver, 10)
-        job_cards = wait.until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".srp-jobtuple-wrapper, article.jobTuple, .cust-job-tuple, [class*='jobTuple']"))
-        )
 
-        for card in job_cards:
-            try:
-                title_el = card.find_element(By.CSS_SELECTOR, "a.title, a[class*='title'], .job-title a, h2 a")
-                title = title_el.text.strip()
-                link = title_el.get_attribute("href") or ""
+def _parse_cards_element(driver, job_cards):
+    """Extract cards one WebDriver call at a time (fallback path)."""
+    jobs = []
+    for card in job_cards:
+        try:
+            title_el = locators.find(card, "search.title")
+            if title_el is None:
+                continue
+            title = title_el.text.strip()
+            link = title_el.get_attribute("href") or ""
+
+            company_el = locators.find(card, "search.company")
+            location_el = locators.find(card, "search.location")
+            experience_el = locators.find(card, "search.experience")
+
+            company = company_el.text.strip() if company_el else None
+            location = location_el.text.strip() if location_el else None
+            experience = experience_el.text.strip() if experience_el else None
+
+            # Same snippet as _EXTRACT_CARDS_JS: description text followed by the tags
+            snippet_el = locators.find(card, "search.snippet")
+            parts = [snippet_el.text.strip() if snippet_el else ""]
+            parts += [tag.text.strip() for tag in locators.find_all(card, "search.tags")]
+            snippet = " ".join(parts).strip()
+
+            if title and link:
+                jobs.append(_make_job(title, link, company, location, experience, snippet))
+        except Exception:
+            continue
+    return jobs
 
-                try:
-                    company = card.find_element(By.CSS_SELECTOR, "a.comp-name, .comp-name, [class*='companyName'], .subTitle a").text.strip()
-                except Exception:
-                    company = "Unknown"
 
-                try:
-                    location = card.find_element(By.CSS_SELECTOR, ".loc, .locWdth, [class*='location'], .location").text.strip()
-                except Exception:
-                    location = "Unknown"
+def parse_job_listings(driver, mode="script"):
+    """Extract job cards from the current search results page.
+
+    ``mode="script"`` pulls all card fields in one ``execute_script`` call and
+    falls back to the per-element path if that fails; ``mode="element"``
+    always uses the per-element path.
+    """
+    jobs = []
+
+    try:
+        job_cards = locators.wait_for_locator(driver, "search.card", timeout=10, multiple=True)
 
+        started = time.perf_counter()
+        used = mode
+        with span("search.parse_cards"):
+            if mode == "script":
                 try:
-                    experience = card.find_element(By.CSS_SELECTOR, ".exp, .expwdth, [class*='experience']").text.strip()
-                except Exception:
-                    experience = ""
-
-                # Extract job ID from URL
-                job_id = ""
-                if link:
-                    parts = link.rstrip("/").split("-")
-                    for part in reversed(parts):
-                        cleaned = part.split("?")[0]
-                        if cleaned.isdigit():
-                            job_id = cleaned
-                            break
-
-                if title and link:
-                    jobs.append({
-                        "title": title,
-                        "company": company,
-                        "location": location,
-                        "experience": experience,
-                        "link": link,
-                        "job_id": job_id,
-                    })
-            except Exception:
-                continue
+                    jobs = _parse_cards_script(driver)
+                except Exception as e:
+                    log_warn(f"  Bulk extraction failed, falling back to per-element parsing: {e}")
+                    used = "element"
+            if used == "element":
+                jobs = _parse_cards_element(driver, job_cards)
+
+        elapsed = time.perf_counter() - started
+        log_info(f"  Parsed {len(job_cards)} cards in {elapsed:.2f}s ({used})")
 
     except Exception as e:
         log_warn(f"Could not parse job listings: {e}")
@@ -103,8 +215,8 @@ def parse_job_listings(driver):
 def paginate(driver):
     """Navigate to the next page of search results. Returns True if successful."""
     try:
-        next_btn = driver.find_element(By.CSS_SELECTOR, "a.fright, a[class*='next'], .pagination a:last-child")
-        if next_btn.is_displayed() and next_btn.is_enabled():
+        next_btn = locators.find(driver, "search.next_page")
+        if next_btn and next_btn.is_displayed() and next_btn.is_enabled():
             random_scroll(driver)
             random_delay(1, 2)
             next_btn.click()
@@ -117,46 +229,127 @@ def paginate(driver):
     return False
 
 
-def search_jobs(driver, config, max_pages=3):
-    """Search for jobs on Naukri based on config filters.
+def _paginate_from_first(driver, first_page_url, page):
+    """Go from the first results page to ``page`` live. Returns False if pagination ends first."""
+    if driver.current_url != first_page_url:
+        with span("driver.get:search"):
+            driver.get(first_page_url)
+        random_delay(2, 4)
+    for _ in range(page - 1):
+        if not paginate(driver):
+            return False
+    return True
+
 
-    Returns a combined list of job dicts across all keywords and pages.
+def iter_job_pages(driver, config, max_pages=3, known_keys=None):
+    """Search Naukri and yield each page's new unique jobs as soon as it is parsed.
+
+    Jobs are deduplicated by job_id/link across all keywords and pages. The
+    driver may be used between pages (e.g. to apply to the yielded jobs): the
+    generator returns to the results page it left before paginating. When
+    ``known_keys`` (job_ids/links already applied to) is given, a keyword stops
+    paginating as soon as a whole page consists of known jobs.
+
+    With the search cache enabled, a keyword whose page 1 is unchanged since
+    a crawl within the TTL takes its remaining pages from the cache instead
+    of paginating. At the first page the cache doesn't have, it goes back
+    to paginating live from that page on.
     """
     keywords = config.get("search", {}).get("keywords", [])
     if not keywords:
         log_error("No search keywords configured")
-        return []
+        return
 
-    all_jobs = []
-
-    for keyword in keywords:
-        url = _build_search_url(keyword, config)
-        log_info(f"Searching: {keyword}")
-        log_info(f"URL: {url}")
+    extraction = config.get("search", {}).get("extraction", "script")
+    cache = SearchCache.from_config(config)
+    seen = set()
 
-        driver.get(url)
-        random_delay(3, 5)
+    def unseen(jobs):
+        new_jobs = []
+        for job in jobs:
+            key = job_key(job)
+            if key and key not in seen:
+                seen.add(key)
+                new_jobs.append(job)
+        return new_jobs
 
-        for page in range(1, max_pages + 1):
-            log_info(f"  Page {page}...")
-            random_scroll(driver)
-            random_delay(1, 2)
+    try:
+        for keyword in keywords:
+            url = _build_search_url(keyword, config)
+            log_info(f"Searching: {keyword}")
+            log_info(f"URL: {url}")
 
-            jobs = parse_job_listings(driver)
-            log_info(f"  Found {len(jobs)} jobs on page {page}")
-            all_jobs.extend(jobs)
+            with span("driver.get:search"):
+                driver.get(url)
+            random_delay(3, 5)
 
-            if page < max_pages and not paginate(driver):
-                break
+            from_cache = False
+            first_page_url = None
+            for page in range(1, max_pages + 1):
+                if from_cache:
+                    cached_jobs = cache.get(url, page)
+                    if cached_jobs is not None:
+                        new_jobs = unseen(cached_jobs)
+                        if new_jobs:
+                            yield new_jobs
+                        continue
+                    # Never cached, evicted or expired: crawl the rest live, starting here
+                    log_info(f"  Page {page} not cached — paginating from here")
+                    from_cache = False
+                    if not _paginate_from_first(driver, first_page_url, page):
+                        break
+
+                log_info(f"  Page {page}...")
+                random_scroll(driver)
+                random_delay(1, 2)
+
+                jobs = parse_job_listings(driver, mode=extraction)
+                log_info(f"  Found {len(jobs)} jobs on page {page}")
+                JOBS_FOUND.inc(len(jobs), keyword=keyword)
+                page_url = driver.current_url
+
+                if cache is not None and page == 1 and jobs and cache.matches(url, 1, jobs):
+                    log_info("  Page 1 unchanged since last crawl — using cached pages")
+                    from_cache = True
+                    first_page_url = page_url
+                    new_jobs = unseen(jobs)
+                    if new_jobs:
+                        yield new_jobs
+                    continue
+
+                if cache is not None:
+                    cache.put(url, page, jobs)
+
+                new_jobs = unseen(jobs)
+                if new_jobs:
+                    yield new_jobs
+
+                if known_keys and jobs and all(is_known(job, known_keys) for job in jobs):
+                    log_info(f"  Page {page} is entirely already-applied jobs — stopping '{keyword}'")
+                    break
+
+                if page < max_pages:
+                    if driver.current_url != page_url:
+                        with span("driver.get:search"):
+                            driver.get(page_url)
+                        random_delay(2, 4)
+                    if not paginate(driver):
+                        break
+    finally:
+        if cache is not None:
+            cache.save()
+            cache.log_stats()
+
+
+def search_jobs(driver, config, max_pages=3, known_keys=None):
+    """Search for jobs on Naukri based on config filters.
 
-    # Deduplicate by job_id
-    seen = set()
+    Returns a combined list of unique job dicts across all keywords and pages.
+    See ``iter_job_pages`` for the streaming variant.
+    """
     unique_jobs = []
-    for job in all_jobs:
-        key = job.get("job_id") or job.get("link")
-        if key and key not in seen:
-            seen.add(key)
-            unique_jobs.append(job)
+    for page_jobs in iter_job_pages(driver, config, max_pages=max_pages, known_keys=known_keys):
+        unique_jobs.extend(page_jobs)
 
     log_info(f"Total unique jobs found: {len(unique_jobs)}")
     return unique_jobs
@@ -0,0 +1,119 @@
+"""On-disk cache of parsed search result pages.
+
+Entries are keyed by (search URL, page number) and hold the parsed job
+dicts, the fetch time and a hash of the page content. When page 1 of a
+search still hashes the same as the cached copy within the TTL, the
+listings haven't moved, so the remaining pages are served from the cache
+instead of being paginated again. The cache is bounded by entry count with
+least-recently-used eviction.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from src.tracker import DATA_DIR
+from src.utils import log_info
+
+CACHE_FILE = os.path.join(DATA_DIR, "search_cache.json")
+
+
+def content_hash(jobs):
+    """Stable hash of a page's parsed content (ids, titles, companies, order)."""
+    digest = hashlib.sha1()
+    for job in jobs:
+        digest.update(f"{job.get('job_id')}|{job.get('link')}|{job.get('title')}|{job.get('company')}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SearchCache:
+    def __init__(self, path=CACHE_FILE, ttl_seconds=6 * 3600, max_entries=500):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries = self._load()
+        self._dirty = False
+
+    @classmethod
+    def from_config(cls, config):
+        cache_cfg = config.get("search_cache", {})
+        if not cache_cfg.get("enabled", True):
+            return None
+        return cls(
+            ttl_seconds=cache_cfg.get("ttl_minutes", 360) * 60,
+            max_entries=cache_cfg.get("max_entries", 500),
+        )
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _key(url, page):
+        return f"{url}#{page}"
+
+    def _fresh_entry(self, url, page):
+        entry = self._entries.get(self._key(url, page))
+        if entry and time.time() - entry["fetched_at"] <= self.ttl_seconds:
+            return entry
+        return None
+
+    def matches(self, url, page, jobs):
+        """True if the cached copy of this page is fresh and has the same content."""
+        entry = self._fresh_entry(url, page)
+        return entry is not None and entry["hash"] == content_hash(jobs)
+
+    def get(self, url, page):
+        """Return the cached jobs for a fresh page (counted as a hit), else None."""
+        entry = self._fresh_entry(url, page)
+        if entry is None:
+            return None
+        entry["last_used"] = time.time()
+        self._dirty = True
+        self.stats["hits"] += 1
+        return [dict(job) for job in entry["jobs"]]
+
+    def put(self, url, page, jobs):
+        """Store a freshly crawled page (counted as a miss)."""
+        now = time.time()
+        self._entries[self._key(url, page)] = {
+            "fetched_at": now,
+            "last_used": now,
+            "hash": content_hash(jobs),
+            "jobs": [dict(job) for job in jobs],
+        }
+        self._dirty = True
+        self.stats["misses"] += 1
+        self._evict()
+
+    def _evict(self):
+        overflow = len(self._entries) - self.max_entries
+        if overflow <= 0:
+            return
+        oldest = sorted(self._entries, key=lambda key: self._entries[key]["last_used"])[:overflow]
+        for key in oldest:
+            del self._entries[key]
+        self.stats["evictions"] += overflow
+
+    def save(self):
+        if not self._dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": self._entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def log_stats(self):
+        log_info(
+            f"Search cache: {self.stats['hits']} hits, {self.stats['misses']} misses, "
+            f"{self.stats['evictions']} evicted, {len(self._entries)} entries"
+        )
@@ -0,0 +1,258 @@
+"""Driver supervisor: recycles a bloated Chrome and reaps leaked processes.
+
+``SupervisedDriver`` wraps the driver from ``create_driver`` and forwards
+everything to it. Before each ``get`` it checks the page count and, every
+few pages, the resident memory of the Chrome process tree; past either
+threshold it saves the session cookies, quits Chrome and launches a fresh
+one with the same session restored, falling back to a fresh login if the
+restored session doesn't work. Navigation invalidates element references
+anyway, so callers holding the wrapper never notice the swap.
+
+PIDs of the Chrome tree and chromedriver are written to
+``data/browser_pids/<owner pid>.json``, one file per running process, so a
+CLI run next to the daemon doesn't clobber the daemon's record. If a run
+dies without quitting, the next run kills its processes at startup
+(``reap_orphans``).
+"""
+
+import glob
+import json
+import os
+
+import psutil
+
+from src.auth import SessionLostError, is_logged_in, load_cookies, login, save_cookies
+from src.browser import create_driver
+from src.tracker import DATA_DIR
+from src.utils import log_info, log_warn
+
+PID_DIR = os.path.join(DATA_DIR, "browser_pids")
+# Single shared file written by earlier versions
+LEGACY_PID_FILE = os.path.join(DATA_DIR, "browser_pids.json")
+
+DEFAULTS = {
+    "max_memory_mb": 1500,
+    "max_pages": 150,
+    "sample_every_pages": 10,
+}
+
+
+def _process_tree(pid):
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+
+def browser_rss_mb(driver):
+    """Resident memory of the Chrome process tree in MB, or None if unknown."""
+    pid = getattr(driver, "browser_pid", None)
+    procs = _process_tree(pid) if pid else []
+    if not procs:
+        return None
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
+
+
+def _driver_processes(driver):
+    procs = _process_tree(getattr(driver, "browser_pid", None) or 0)
+    service_process = getattr(getattr(driver, "service", None), "process", None)
+    if service_process is not None:
+        procs += _process_tree(service_process.pid)
+    return procs
+
+
+def _pid_file():
+    return os.path.join(PID_DIR, f"{os.getpid()}.json")
+
+
+def _write_pid_file(driver):
+    entries = []
+    for proc in _driver_processes(driver):
+        try:
+            entries.append({"pid": proc.pid, "create_time": proc.create_time()})
+        except psutil.Error:
+            continue
+    owner = psutil.Process()
+    path = _pid_file()
+    os.makedirs(PID_DIR, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"owner": {"pid": owner.pid, "create_time": owner.create_time()}, "processes": entries}, f)
+    os.replace(tmp_path, path)
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _same_process(entry):
+    """Return the live process for a recorded pid, or None if it exited or the pid was reused."""
+    try:
+        proc = psutil.Process(entry["pid"])
+        return proc if abs(proc.create_time() - entry["create_time"]) < 1 else None
+    except psutil.Error:
+        return None
+
+
+def _orphans(path):
+    """Return the live processes recorded in ``path`` if the run that wrote it is gone.
+
+    Returns None while that run is still going.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if _same_process(data["owner"]) is not None:
+        return None
+    return [proc for proc in map(_same_process, data.get("processes", [])) if proc is not None]
+
+
+def reap_orphans():
+    """Kill Chrome/chromedriver processes left behind by runs that died. Returns the number killed."""
+    paths = glob.glob(os.path.join(PID_DIR, "*.json"))
+    if os.path.exists(LEGACY_PID_FILE):
+        paths.append(LEGACY_PID_FILE)
+
+    orphans = []
+    for path in paths:
+        found = _orphans(path)
+        if found is None:
+            # The run that launched them is still going
+            continue
+        orphans += found
+        _remove(path)
+    if not orphans:
+        return 0
+
+    for proc in orphans:
+        try:
+            proc.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(orphans, timeout=5)
+    for proc in alive:
+        try:
+            proc.kill()
+        except psutil.Error:
+            pass
+    log_warn(f"Reaped {len(orphans)} orphaned browser processes from an earlier run")
+    return len(orphans)
+
+
+class SupervisedDriver:
+    """A driver wrapper that recycles Chrome past memory or page-count limits."""
+
+    def __init__(self, headless=True, browser_config=None, max_memory_mb=1500, max_pages=150,
+                 sample_every_pages=10):
+        self.headless = headless
+        self.browser_config = browser_config
+        self.max_memory_mb = max_memory_mb
+        self.max_pages = max_pages
+        self.sample_every_pages = sample_every_pages
+        self.stats = {"launches": 0, "recycles": 0, "peak_rss_mb": 0.0}
+        self.pages = 0
+        self.session_lost = False
+
+        reap_orphans()
+        self._driver = None
+        self._launch()
+
+    @classmethod
+    def from_config(cls, config, headless=True):
+        settings = {**DEFAULTS, **config.get("supervisor", {})}
+        return cls(
+            headless=headless,
+            browser_config=config.get("browser"),
+            max_memory_mb=settings["max_memory_mb"],
+            max_pages=settings["max_pages"],
+            sample_every_pages=settings["sample_every_pages"],
+        )
+
+    def __getattr__(self, name):
+        # Only called for attributes not defined here: forward to the live driver
+        return getattr(self._driver, name)
+
+    def _launch(self):
+        self._driver = create_driver(headless=self.headless, browser_config=self.browser_config)
+        self.pages = 0
+        self.stats["launches"] += 1
+        _write_pid_file(self._driver)
+
+    def rss_mb(self):
+        rss = browser_rss_mb(self._driver)
+        if rss is not None:
+            self.stats["peak_rss_mb"] = max(self.stats["peak_rss_mb"], round(rss, 1))
+        return rss
+
+    def recycle_reason(self, sample_memory=False):
+        """Why the browser should be recycled now, or None.
+
+        Memory is sampled every ``sample_every_pages`` pages (every page if
+        that is 0), or now if ``sample_memory``.
+        """
+        if self.max_pages and self.pages >= self.max_pages:
+            return f"{self.pages} pages loaded"
+        every = self.sample_every_pages or 1
+        if self.max_memory_mb and (sample_memory or self.pages % every == 0):
+            rss = self.rss_mb()
+            if rss is not None and rss > self.max_memory_mb:
+                return f"browser memory {rss:.0f} MB > {self.max_memory_mb} MB"
+        return None
+
+    def recycle(self, reason="requested"):
+        """Restart Chrome and carry the logged-in session over via the cookie store.
+
+        The restored session is verified; if it doesn't work, this logs in
+        afresh. If that fails too, this and every later ``get`` raise
+        SessionLostError, so a run never carries on logged out.
+        """
+        log_info(f"Recycling browser ({reason})...")
+        try:
+            save_cookies(self._driver)
+        except Exception as e:
+            log_warn(f"Could not save cookies before recycling: {e}")
+        self._quit_browser()
+        self._launch()
+        self.stats["recycles"] += 1
+        if load_cookies(self._driver) and is_logged_in(self._driver):
+            return
+        log_warn("Session did not survive the browser recycle — logging in again")
+        if not login(self._driver, fresh=True):
+            self.session_lost = True
+            raise SessionLostError("login failed after recycling the browser")
+
+    def maybe_recycle(self, sample_memory=False):
+        reason = self.recycle_reason(sample_memory)
+        if reason:
+            self.recycle(reason)
+            return True
+        return False
+
+    def get(self, url):
+        if self.session_lost:
+            raise SessionLostError("not logged in since the last browser recycle")
+        self.maybe_recycle()
+        self.pages += 1
+        return self._driver.get(url)
+
+    def _quit_browser(self):
+        try:
+            self._driver.quit()
+        except Exception:
+            pass
+
+    def quit(self):
+        self._quit_browser()
+        _remove(_pid_file())
@@ -1,12 +1,33 @@
+import atexit
 import csv
 import json
 import os
+import sys
+import tempfile
+import threading
 from collections import Counter
 from datetime import date
 
+from src.perf import span
+
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 APPLIED_FILE = os.path.join(DATA_DIR, "applied.json")
 
+CSV_FIELDS = ["job_id", "title", "company", "location", "link", "date", "status", "score"]
+
+
+def get_backend(config=None):
+    """Return the tracker storage module selected by ``tracker.backend`` in config.
+
+    ``"json"`` (default) is this module; ``"sqlite"`` is ``src.tracker_db``.
+    Both expose the same functions.
+    """
+    backend = (config or {}).get("tracker", {}).get("backend", "json")
+    if backend == "sqlite":
+        from src import tracker_db
+        return tracker_db
+    return sys.modules[__name__]
+
 
 def load_applied():
     """Read applied jobs from JSON file."""
@@ -21,11 +42,35 @@ def load_applied():
 
 def save_applied(job):
     """Append a single applied job to the JSON file."""
+    save_many([job])
+
+
+def save_many(jobs):
+    """Append several applied jobs to the JSON file in one rewrite."""
+    if not jobs:
+        return
     os.makedirs(DATA_DIR, exist_ok=True)
     applied = load_applied()
-    applied.append(job)
-    with open(APPLIED_FILE, "w", encoding="utf-8") as f:
-        json.dump(applied, f, indent=2, ensure_ascii=False)
+    applied.extend(jobs)
+    _write_atomic(applied)
+
+
+def _write_atomic(applied):
+    """Write the full history to a temp file and rename it over APPLIED_FILE.
+
+    A crash mid-write leaves the previous file intact instead of a truncated one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=DATA_DIR, prefix=".applied-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(applied, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, APPLIED_FILE)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def is_already_applied(job_id):
@@ -36,6 +81,17 @@ def is_already_applied(job_id):
     return any(j.get("job_id") == job_id for j in applied)
 
 
+def load_applied_keys(backend=None):
+    """Return the set of job_ids and links already in the tracker history."""
+    backend = backend or sys.modules[__name__]
+    keys = set()
+    for job in backend.load_applied():
+        for key in (job.get("job_id"), job.get("link")):
+            if key:
+                keys.add(key)
+    return keys
+
+
 def get_stats():
     """Return summary statistics about applied jobs."""
     applied = load_applied()
@@ -61,11 +117,92 @@ def export_csv(output_path=None):
     if output_path is None:
         output_path = os.path.join(DATA_DIR, "applied_jobs.csv")
 
-    fieldnames = ["job_id", "title", "company", "location", "link", "date", "status"]
-
     with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
         writer.writeheader()
         writer.writerows(applied)
 
     return output_path
+
+
+class SessionTracker:
+    """Session-scoped tracker for the apply loop.
+
+    Loads history once into a set keyed by job_id and link, answers duplicate
+    checks in memory and buffers new records. Buffered records are written to
+    the backend every ``flush_every`` records, ``flush_interval`` seconds after
+    the first unflushed record, and on ``close()`` / interpreter exit.
+    """
+
+    def __init__(self, backend=None, flush_every=10, flush_interval=60.0):
+        self.backend = backend or sys.modules[__name__]
+        self.flush_every = max(1, int(flush_every))
+        self.flush_interval = flush_interval
+        self._keys = set()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+        for job in self.backend.load_applied():
+            self._remember(job)
+
+        atexit.register(self.flush)
+
+    @classmethod
+    def from_config(cls, config):
+        tracker_cfg = config.get("tracker", {})
+        return cls(
+            get_backend(config),
+            flush_every=tracker_cfg.get("flush_every", 10),
+            flush_interval=tracker_cfg.get("flush_interval", 60.0),
+        )
+
+    def _remember(self, job):
+        for key in (job.get("job_id"), job.get("link")):
+            if key:
+                self._keys.add(key)
+
+    def is_already_applied(self, job_id, link=None):
+        """Check history and buffered records without touching storage."""
+        return bool(job_id and job_id in self._keys) or bool(link and link in self._keys)
+
+    def record(self, job):
+        """Buffer an applied job; flush once ``flush_every`` records are pending."""
+        with self._lock:
+            self._remember(job)
+            self._pending.append(job)
+            pending = len(self._pending)
+            if self._timer is None and self.flush_interval:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered records to the backend in one batch."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            batch, self._pending = self._pending, []
+            if batch:
+                try:
+                    with span("tracker.flush", kind="local"):
+                        self.backend.save_many(batch)
+                except Exception:
+                    # Keep the records so the next flush (or exit) retries them
+                    self._pending = batch + self._pending
+                    raise
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
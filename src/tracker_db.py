@@ -0,0 +1,181 @@
+"""SQLite storage engine for the application tracker.
+
+Exposes the same functions as ``src.tracker`` so either module can be used
+as the tracker backend. On first use the existing ``data/applied.json``
+history is imported once.
+"""
+
+import csv
+import json
+import os
+import sqlite3
+import threading
+from datetime import date
+
+from src.tracker import APPLIED_FILE, DATA_DIR, CSV_FIELDS
+
+DB_FILE = os.path.join(DATA_DIR, "applied.db")
+
+# Columns stored natively; any other keys on a record go into ``extra``.
+COLUMNS = ["job_id", "title", "company", "location", "link", "date", "status"]
+
+_INSERT_SQL = (
+    f"INSERT INTO applied ({', '.join(COLUMNS)}, extra) "
+    f"VALUES ({', '.join('?' for _ in COLUMNS)}, ?)"
+)
+
+SCHEMA_VERSION = 1
+
+_conn = None
+_lock = threading.Lock()
+
+
+def _connect():
+    """Open (once) the tracker database and run schema setup + migration."""
+    global _conn
+    with _lock:
+        if _conn is not None:
+            return _conn
+
+        os.makedirs(DATA_DIR, exist_ok=True)
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS applied (
+                id       INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id   TEXT,
+                title    TEXT,
+                company  TEXT,
+                location TEXT,
+                link     TEXT,
+                date     TEXT,
+                status   TEXT,
+                extra    TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_applied_job_id ON applied(job_id);
+            CREATE INDEX IF NOT EXISTS idx_applied_date ON applied(date);
+            """
+        )
+
+        # Version check, import and version bump commit together: another
+        # process migrating at the same time blocks on BEGIN IMMEDIATE, then
+        # sees the new version, and a crash mid-import leaves nothing behind
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                _migrate_from_json(conn)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            conn.close()
+            raise
+
+        _conn = conn
+        return conn
+
+
+def _migrate_from_json(conn):
+    """Import records from the legacy JSON tracker file (runs once).
+
+    Runs inside the caller's transaction; nothing is committed here.
+    """
+    if not os.path.exists(APPLIED_FILE):
+        return
+    with open(APPLIED_FILE, "r", encoding="utf-8") as f:
+        try:
+            records = json.load(f)
+        except json.JSONDecodeError:
+            return
+    conn.executemany(_INSERT_SQL, [_to_row(job) for job in records])
+
+
+def _to_row(job):
+    extra = {k: v for k, v in job.items() if k not in COLUMNS}
+    values = [job.get(col) for col in COLUMNS]
+    values.append(json.dumps(extra, ensure_ascii=False) if extra else None)
+    return values
+
+
+def _from_row(row):
+    job = {col: row[col] for col in COLUMNS if row[col] is not None}
+    if row["extra"]:
+        job.update(json.loads(row["extra"]))
+    return job
+
+
+def load_applied():
+    """Read all applied jobs from the database, oldest first."""
+    conn = _connect()
+    with _lock:
+        rows = conn.execute("SELECT * FROM applied ORDER BY id").fetchall()
+    return [_from_row(row) for row in rows]
+
+
+def save_applied(job):
+    """Insert a single applied job."""
+    save_many([job])
+
+
+def save_many(jobs):
+    """Insert several applied jobs in one transaction."""
+    if not jobs:
+        return
+    conn = _connect()
+    with _lock, conn:
+        conn.executemany(_INSERT_SQL, [_to_row(job) for job in jobs])
+
+
+def is_already_applied(job_id):
+    """Check if a job has already been applied to (indexed lookup)."""
+    if not job_id:
+        return False
+    conn = _connect()
+    with _lock:
+        row = conn.execute(
+            "SELECT 1 FROM applied WHERE job_id = ? LIMIT 1", (job_id,)
+        ).fetchone()
+    return row is not None
+
+
+def get_stats():
+    """Return summary statistics about applied jobs."""
+    conn = _connect()
+    today = str(date.today())
+
+    with _lock:
+        total = conn.execute("SELECT COUNT(*) FROM applied").fetchone()[0]
+        today_count = conn.execute(
+            "SELECT COUNT(*) FROM applied WHERE date = ?", (today,)
+        ).fetchone()[0]
+        companies = conn.execute(
+            "SELECT COALESCE(company, 'Unknown') AS company, COUNT(*) AS n "
+            "FROM applied GROUP BY 1 ORDER BY n DESC LIMIT 20"
+        ).fetchall()
+
+    return {
+        "total": total,
+        "today": today_count,
+        "by_company": {row["company"]: row["n"] for row in companies},
+    }
+
+
+def export_csv(output_path=None):
+    """Export applied jobs to a CSV file."""
+    applied = load_applied()
+    if not applied:
+        return None
+
+    if output_path is None:
+        output_path = os.path.join(DATA_DIR, "applied_jobs.csv")
+
+    with open(output_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(applied)
+
+    return output_path
@@ -1,80 +1,171 @@
+import atexit
+import copy
+import gzip
+import json
 import logging
 import os
+import queue
 import random
+import shutil
+import sys
 import time
-from logging.handlers import RotatingFileHandler
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from colorama import Fore, Style, init
 
+from src.perf import span
+
 init(autoreset=True)
 
 LOG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
+JSON_LOG_FILE = os.path.join(LOG_DIR, "app.jsonl")
+
+_LEVEL_STYLES = {
+    logging.DEBUG: (Style.DIM, "[.]"),
+    logging.INFO: (Fore.GREEN, "[+]"),
+    logging.WARNING: (Fore.YELLOW, "[!]"),
+    logging.ERROR: (Fore.RED, "[-]"),
+    logging.CRITICAL: (Fore.RED, "[-]"),
+}
+
+
+class _ColorFormatter(logging.Formatter):
+    """Console format: colored ``[+]``/``[!]``/``[-]`` prefix by level."""
+
+    def format(self, record):
+        color, prefix = _LEVEL_STYLES.get(record.levelno, ("", "[?]"))
+        return f"{color}{prefix} {super().format(record)}{Style.RESET_ALL}"
+
+
+class _JsonFormatter(logging.Formatter):
+    """One JSON object per line, for machine parsing."""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _TracebackQueueHandler(QueueHandler):
+    """``QueueHandler`` that keeps the traceback apart from the message.
+
+    The stock ``prepare`` folds the traceback into ``msg`` and clears the
+    exception fields, so the JSON log could only get it flattened into
+    ``"msg"``. Here it travels as ``exc_text``, which the text formatter
+    appends as usual and ``_JsonFormatter`` writes to ``"exc"``.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        # Tracebacks hold frames; only the formatted text crosses the queue
+        record.exc_info = None
+        return record
+
+
+def _gzip_rotator(source, dest):
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _compressed_rotating_handler(path, formatter):
+    """5 MB files, 3 gzip-compressed backups (``app.log.1.gz`` ...)."""
+    handler = RotatingFileHandler(path, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8")
+    handler.namer = lambda name: name + ".gz"
+    handler.rotator = _gzip_rotator
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(formatter)
+    return handler
 
 
 def setup_logger():
-    """Configure file + console logging with rotation."""
-    os.makedirs(LOG_DIR, exist_ok=True)
+    """Configure console logging plus queued, rotating text and JSON-lines files.
 
+    Console output is written directly so it stays in order with other
+    terminal output; file writes (and their flushes and compressed rotation)
+    happen on a ``QueueListener`` thread, off the calling thread.
+    """
     logger = logging.getLogger("nakuri")
     logger.setLevel(logging.DEBUG)
 
     if logger.handlers:
         return logger
 
-    # Rotating file handler — 5 MB max, keep 3 backups
-    file_handler = RotatingFileHandler(
-        LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=3, encoding="utf-8"
-    )
-    file_handler.setLevel(logging.DEBUG)
-    file_fmt = logging.Formatter(
+    os.makedirs(LOG_DIR, exist_ok=True)
+    logger.propagate = False
+
+    text_handler = _compressed_rotating_handler(LOG_FILE, logging.Formatter(
         "%(asctime)s | %(levelname)-8s | %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
-    )
-    file_handler.setFormatter(file_fmt)
+    ))
+    json_handler = _compressed_rotating_handler(JSON_LOG_FILE, _JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, text_handler, json_handler, respect_handler_level=True)
+    listener.start()
+    # Drains the queue so the last messages reach the files
+    atexit.register(listener.stop)
 
-    # Console handler with color
-    console_handler = logging.StreamHandler()
+    console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_fmt = logging.Formatter("%(message)s")
-    console_handler.setFormatter(console_fmt)
+    console_handler.setFormatter(_ColorFormatter("%(message)s"))
 
-    logger.addHandler(file_handler)
+    logger.addHandler(_TracebackQueueHandler(log_queue))
     logger.addHandler(console_handler)
 
     return logger
 
 
+def _logger():
+    logger = logging.getLogger("nakuri")
+    return logger if logger.handlers else setup_logger()
+
+
 def random_delay(min_s=2.0, max_s=5.0):
     """Sleep for a random duration to mimic human behavior."""
     delay = random.uniform(min_s, max_s)
     logging.getLogger("nakuri").debug(f"Sleeping {delay:.1f}s")
-    time.sleep(delay)
+    with span("random_delay", kind="delay"):
+        time.sleep(delay)
 
 
 def human_type(element, text, min_delay=0.05, max_delay=0.15):
     """Type text character by character with random inter-key delays."""
-    for char in text:
-        element.send_keys(char)
-        time.sleep(random.uniform(min_delay, max_delay))
+    # One span for the whole call: per-keystroke spans cost more than they tell.
+    # Deliberately paced typing is mostly sleep, so it counts as a delay.
+    with span("human_type", kind="delay"):
+        for char in text:
+            element.send_keys(char)
+            time.sleep(random.uniform(min_delay, max_delay))
 
 
 def random_scroll(driver):
     """Scroll page by a random amount to simulate human browsing."""
     scroll_amount = random.randint(200, 600)
-    driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-    time.sleep(random.uniform(0.3, 0.8))
+    with span("random_scroll.execute"):
+        driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
+    with span("random_scroll.delay", kind="delay"):
+        time.sleep(random.uniform(0.3, 0.8))
 
 
 def log_info(msg):
-    print(f"{Fore.GREEN}[+] {msg}{Style.RESET_ALL}")
-    logging.getLogger("nakuri").info(msg)
+    _logger().info(msg)
 
 
 def log_warn(msg):
-    print(f"{Fore.YELLOW}[!] {msg}{Style.RESET_ALL}")
-    logging.getLogger("nakuri").warning(msg)
+    _logger().warning(msg)
 
 
 def log_error(msg):
-    print(f"{Fore.RED}[-] {msg}{Style.RESET_ALL}")
-    logging.getLogger("nakuri").error(msg)
+    _logger().error(msg)
@@ -0,0 +1,110 @@
+"""Explicit wait policy for element lookups.
+
+``create_driver`` turns implicit waits off, so a plain ``find_element`` on a
+missing element fails immediately instead of stalling. Lookups that may
+legitimately need to wait go through ``wait_for`` with their own timeout, and
+optional elements use the non-blocking ``find_if_present``. Time spent
+waiting on elements that were never found is tracked per label; only
+waits that actually blocked and timed out count towards the
+``naukri_element_wait_timeouts_total`` metric.
+"""
+
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.metrics import ELEMENT_WAIT_SECONDS, ELEMENT_WAIT_TIMEOUTS
+from src.utils import log_info
+
+DEFAULT_TIMEOUT = 10
+
+# label -> [misses, seconds spent waiting before giving up]
+_misses = defaultdict(lambda: [0, 0.0])
+_lookups = 0
+
+
+def _record_miss(label, elapsed, waited):
+    entry = _misses[label]
+    entry[0] += 1
+    entry[1] += elapsed
+    if waited:
+        ELEMENT_WAIT_TIMEOUTS.inc(label=label)
+        ELEMENT_WAIT_SECONDS.inc(elapsed)
+
+
+def find_if_present(scope, by, selector, label=None):
+    """Return the first element matching ``selector`` under ``scope``, or None.
+
+    Never waits: relies on implicit waits being disabled.
+    """
+    global _lookups
+    _lookups += 1
+    started = time.perf_counter()
+    elements = scope.find_elements(by, selector)
+    if elements:
+        return elements[0]
+    _record_miss(label or selector, time.perf_counter() - started, waited=False)
+    return None
+
+
+def wait_for(scope, condition, timeout=DEFAULT_TIMEOUT, label="element"):
+    """Wait up to ``timeout`` seconds for ``condition``; raises TimeoutException."""
+    global _lookups
+    _lookups += 1
+    started = time.perf_counter()
+    try:
+        return WebDriverWait(scope, timeout).until(condition)
+    except TimeoutException:
+        # A zero timeout is a single check (e.g. ``locators.find``), not a wait
+        _record_miss(label, time.perf_counter() - started, waited=timeout > 0)
+        raise
+
+
+def wait_optional(scope, condition, timeout, label="element"):
+    """Like ``wait_for`` but returns None instead of raising on timeout."""
+    try:
+        return wait_for(scope, condition, timeout=timeout, label=label)
+    except TimeoutException:
+        return None
+
+
+def wait_for_child(scope, by, selector, timeout=DEFAULT_TIMEOUT, label="element"):
+    """Wait for an element matching ``selector`` to appear under ``scope``."""
+    return wait_for(
+        scope,
+        lambda s: (s.find_elements(by, selector) or [None])[0],
+        timeout=timeout,
+        label=label,
+    )
+
+
+def get_wait_stats():
+    """Return lookup count plus per-label misses and wasted wait time."""
+    return {
+        "lookups": _lookups,
+        "misses": sum(count for count, _ in _misses.values()),
+        "wasted_s": sum(seconds for _, seconds in _misses.values()),
+        "by_label": {label: {"misses": count, "wasted_s": seconds}
+                     for label, (count, seconds) in _misses.items()},
+    }
+
+
+def reset_wait_stats():
+    global _lookups
+    _lookups = 0
+    _misses.clear()
+
+
+def log_wait_stats():
+    """Log how long this run spent waiting on elements that never appeared."""
+    stats = get_wait_stats()
+    log_info(
+        f"Element waits: {stats['lookups']} lookups, {stats['misses']} not found, "
+        f"{stats['wasted_s']:.1f}s spent waiting on missing elements"
+    )
+    worst = sorted(stats["by_label"].items(), key=lambda kv: kv[1]["wasted_s"], reverse=True)
+    for label, entry in worst[:5]:
+        if entry["wasted_s"] >= 0.1:
+            log_info(f"  {label}: {entry['misses']} misses, {entry['wasted_s']:.1f}s")